@@ -0,0 +1,48 @@
+import logging
+import uuid
+import httpx
+from python_a2a import TaskState, TaskStatus
+
+
+class A2AHttpClient:
+    """Envía tareas A2A a agentes remotos reutilizando conexiones HTTP
+
+    Un solo httpx.AsyncClient mantiene un pool de conexiones keep-alive por
+    host, de modo que las tareas a un mismo agente no pagan el costo de
+    abrir una conexión nueva cada vez.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive: int = 20, timeout: float = 120.0,
+                 connect_retries: int = 2):
+        # Los reintentos solo aplican a fallas al conectar (p. ej. un worker reiniciándose)
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive),
+            retries=connect_retries,
+        )
+        self._client = httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(timeout, connect=5.0))
+
+    async def send_task(self, url: str, task):
+        """Envía la tarea a url/tasks/send y copia en ella el estado y los artifacts de la respuesta"""
+        payload = {"id": getattr(task, "id", None) or str(uuid.uuid4()), "message": task.message}
+        try:
+            response = await self._client.post(f"{url.rstrip('/')}/tasks/send", json=payload)
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logging.error(f"[A2A HTTP] ✗ Error al enviar la tarea a {url}: {e}")
+            task.status = TaskStatus(state=TaskState.FAILED, message=error_message(f"Error al enviar la tarea a {url}: {e}"))
+            task.artifacts = []
+            return task
+
+        task.status = TaskStatus.from_dict(data.get("status", {}))
+        task.artifacts = data.get("artifacts", [])
+        return task
+
+    async def aclose(self):
+        """Cierra las conexiones del pool"""
+        await self._client.aclose()
+
+
+def error_message(text: str) -> dict:
+    """Mensaje A2A con la causa de una tarea fallida, para TaskStatus.message"""
+    return {"content": {"type": "text", "text": text}, "role": "agent"}
@@ -0,0 +1,124 @@
+import time
+from typing import Callable, Dict
+from Agents.OrderQueue import OrderQueue, QueuedOrder
+
+
+class Admission:
+    """Resultado de intentar admitir un pedido en la cola de despacho
+
+    status es "accepted", "degraded" (aceptado, pero en el agente por
+    defecto) o "rejected". shed es el pedido en espera que se descartó para
+    hacerle lugar, si lo hubo.
+    """
+
+    def __init__(self, status: str, agent: str, estimated_wait: float, entry: QueuedOrder | None = None,
+                 shed: QueuedOrder | None = None):
+        self.status = status
+        self.agent = agent
+        self.estimated_wait = estimated_wait
+        self.entry = entry
+        self.shed = shed
+
+    @property
+    def accepted(self) -> bool:
+        return self.entry is not None
+
+
+class AdmissionControl:
+    """Colas acotadas por agente y qué hacer cuando un agente está saturado
+
+    Cada agente admite, además de los pedidos que caben en sus lugares de
+    ejecución libres, hasta max_queue_per_agent pedidos en espera (None: sin
+    límite). Así, en el procesamiento por lotes, donde todos los pedidos se
+    admiten antes de que empiece el primero, los que se van a preparar de
+    inmediato no cuentan contra el límite de la cola. Cuando la cola de un
+    agente está llena, la política decide:
+        reject: se rechaza el pedido nuevo
+        shed: se descarta el pedido en espera de menor prioridad (y plazo más
+            lejano) si el nuevo es más urgente; si no, se rechaza el nuevo
+        degrade: el pedido se envía a default_agent si tiene lugar; si no,
+            se rechaza
+
+    La espera estimada es cero si el pedido encuentra un lugar libre; si no,
+    es el trabajo pendiente del agente (pedidos en espera más lo que falta de
+    los que se están preparando) repartido entre sus lugares de ejecución.
+    Es una cota pesimista: no descuenta los pedidos en espera que la
+    política de despacho dejaría atrás.
+    """
+
+    POLICIES = ("reject", "shed", "degrade")
+
+    def __init__(self, queue: OrderQueue, duration: Callable[[str, str], float], slots: Callable[[str], int],
+                 max_queue_per_agent: int | None = None, policy: str = "reject", default_agent: str | None = None,
+                 counts: Dict[str, int] | None = None, clock: Callable[[], float] = time.monotonic):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Política de sobrecarga desconocida: {policy}")
+        if policy == "degrade" and not default_agent:
+            raise ValueError("La política degrade necesita un agente por defecto")
+        if max_queue_per_agent is not None and max_queue_per_agent < 1:
+            raise ValueError(f"El límite de cola por agente debe ser positivo: {max_queue_per_agent}")
+        self.queue = queue
+        self.duration = duration
+        self.slots = slots
+        self.max_queue_per_agent = max_queue_per_agent
+        self.policy = policy
+        self.default_agent = default_agent
+        self.counts = counts if counts is not None else {}
+        self.clock = clock
+        self._running: Dict[str, Dict[QueuedOrder, float]] = {}
+
+    def admit(self, order_id: int, order: Dict, agent: str) -> Admission:
+        """Encola el pedido en el agente asignado o aplica la política de sobrecarga"""
+        if self._has_room(agent):
+            return self._accept("accepted", order_id, order, agent)
+
+        if self.policy == "degrade" and agent != self.default_agent and self._has_room(self.default_agent):
+            return self._accept("degraded", order_id, order, self.default_agent)
+
+        if self.policy == "shed":
+            victim = self.queue.lowest(agent)
+            if victim is not None and (victim.priority, victim.deadline) > self.queue.urgency(order):
+                self.queue.remove(victim)
+                self._count("shed")
+                admission = self._accept("accepted", order_id, order, agent)
+                admission.shed = victim
+                return admission
+
+        self._count("rejected")
+        return Admission("rejected", agent, self.estimate_wait(agent))
+
+    def estimate_wait(self, agent: str) -> float:
+        """Segundos que esperaría un pedido nuevo del agente antes de empezar a prepararse"""
+        if self.queue.depth(agent) < self._free_slots(agent):
+            return 0.0
+        now = self.clock()
+        remaining = sum(max(0.0, entry.duration - (now - started))
+                        for entry, started in self._running.get(agent, {}).items())
+        return (self.queue.queued_work(agent) + remaining) / max(1, self.slots(agent))
+
+    def started(self, entry: QueuedOrder):
+        """Registra que el pedido salió de la cola y se está preparando"""
+        self._running.setdefault(entry.agent, {})[entry] = self.clock()
+
+    def finished(self, entry: QueuedOrder):
+        self._running.get(entry.agent, {}).pop(entry, None)
+
+    def _has_room(self, agent: str) -> bool:
+        if self.max_queue_per_agent is None:
+            return True
+        return self.queue.depth(agent) < self.max_queue_per_agent + self._free_slots(agent)
+
+    def _free_slots(self, agent: str) -> int:
+        """Lugares de ejecución del agente que no están ocupados por pedidos en preparación"""
+        return max(0, self.slots(agent) - len(self._running.get(agent, {})))
+
+    def _accept(self, status: str, order_id: int, order: Dict, agent: str) -> Admission:
+        estimated_wait = self.estimate_wait(agent)
+        entry = self.queue.push(order_id, order, agent, self.duration(agent, order["description"]))
+        entry.admission = status
+        entry.estimated_wait = estimated_wait
+        self._count(status)
+        return Admission(status, agent, estimated_wait, entry)
+
+    def _count(self, status: str):
+        self.counts[status] = self.counts.get(status, 0) + 1
@@ -0,0 +1,205 @@
+import asyncio
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from python_a2a import TaskState, TaskStatus
+from Agents.A2AHttpClient import error_message
+from Recipes.RecipeBook import DEFAULT_MENU_DIR
+
+# Los mensajes entre procesos son JSON compacto por un Pipe:
+#   pedido:    [id, message]            (message es task.message)
+#   respuesta: [id, ok, artifacts | error]
+# Un mensaje vacío le indica al worker que termine.
+_SHUTDOWN = b""
+
+
+def _encode(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _decode(data: bytes):
+    return json.loads(data.decode("utf-8"))
+
+
+class AgentProcess:
+    """Ejecuta un agente cocinero en su propio proceso
+
+    El worker arma su ChefAgent (con sus estaciones y su propio pool MCP) y
+    atiende varias tareas a la vez en su event loop. Desde el orquestador se
+    usa como cualquier agente: handle_task_async(task) espera el resultado
+    sin bloquear el event loop, y el trabajo de CPU del agente no compite
+    por el GIL del proceso principal. env son variables de entorno extra para
+    el worker (p. ej. MCP_INVENTORY_DB y MCP_POOL_SIZE).
+    """
+
+    def __init__(self, chef_name: str, menu_dir: str = DEFAULT_MENU_DIR, agent_card=None,
+                 env: dict[str, str] | None = None):
+        self.chef_name = chef_name
+        self.menu_dir = menu_dir
+        self.agent_card = agent_card
+        self.env = env or {}
+        self._ids = itertools.count(1)
+        self._pending: dict[int, tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._process = None
+        self._reader = None
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process else None
+
+    def start(self):
+        """Lanza el proceso worker y el hilo que recibe sus respuestas"""
+        # spawn: el worker no hereda el event loop ni los hilos del proceso principal
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self.chef_name, self.menu_dir, self.env),
+            name=f"chef-{self.chef_name}",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._reader = threading.Thread(target=self._read_responses, name=f"reader-{self.chef_name}", daemon=True)
+        self._reader.start()
+        logging.info(f"[{self.chef_name}] Proceso worker iniciado (pid {self._process.pid})")
+
+    async def handle_task_async(self, task):
+        """Envía la tarea al worker y copia en ella el estado y los artifacts del resultado"""
+        if self._process is None:
+            raise RuntimeError(f"El proceso de {self.chef_name} no está iniciado")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        request_id = next(self._ids)
+        with self._lock:
+            self._pending[request_id] = (loop, future)
+        try:
+            self._conn.send_bytes(_encode([request_id, task.message]))
+            ok, payload = await future
+        except (OSError, EOFError, ConnectionError) as e:
+            ok, payload = False, str(e) or "el proceso worker terminó"
+        finally:
+            with self._lock:
+                self._pending.pop(request_id, None)
+
+        if not ok:
+            logging.error(f"[{self.chef_name}] ✗ Error en el proceso worker: {payload}")
+            task.status = TaskStatus(state=TaskState.FAILED, message=error_message(payload))
+            task.artifacts = []
+            return task
+        task.status = TaskStatus(state=TaskState.COMPLETED)
+        task.artifacts = payload
+        return task
+
+    async def aclose(self, timeout: float = 10.0):
+        """Pide al worker que termine sus tareas en curso y espera a que salga"""
+        if self._process is None:
+            return
+        try:
+            self._conn.send_bytes(_SHUTDOWN)
+        except OSError:
+            pass
+        await asyncio.to_thread(self._process.join, timeout)
+        if self._process.is_alive():
+            logging.warning(f"[{self.chef_name}] El proceso worker no terminó a tiempo, se detiene")
+            self._process.terminate()
+            await asyncio.to_thread(self._process.join)
+        await asyncio.to_thread(self._reader.join)
+        self._conn.close()
+        self._process = None
+
+    def _read_responses(self):
+        """Hilo que entrega cada respuesta del worker al future que la espera"""
+        while True:
+            try:
+                request_id, ok, payload = _decode(self._conn.recv_bytes())
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                waiter = self._pending.get(request_id)
+            if waiter is not None:
+                loop, future = waiter
+                loop.call_soon_threadsafe(_set_result, future, (ok, payload))
+
+        # El worker terminó: las tareas que quedaban esperando fallan
+        with self._lock:
+            waiters = list(self._pending.values())
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_set_exception, future, ConnectionError("el proceso worker terminó"))
+
+
+def _set_result(future: asyncio.Future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future, error: Exception):
+    if not future.done():
+        future.set_exception(error)
+
+
+def _worker_main(conn, chef_name: str, menu_dir: str, env: dict[str, str]):
+    """Punto de entrada del proceso worker"""
+    os.environ.update(env)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    asyncio.run(_serve(conn, chef_name, menu_dir))
+
+
+async def _serve(conn, chef_name: str, menu_dir: str):
+    """Atiende las tareas que llegan por el Pipe, varias a la vez"""
+    # Importes locales: solo el worker necesita el agente y el cliente MCP
+    from Agents.ChefAgent import ChefAgent
+    from MCP.McpClient import cleanup_mcp_client
+    from Recipes.RecipeBook import RecipeBook
+
+    chef = RecipeBook.from_directory(menu_dir).get_chef(chef_name)
+    if chef is None:
+        raise ValueError(f"No hay un agente llamado {chef_name} en el menú")
+    agent = ChefAgent(chef)
+
+    async def handle(request_id: int, message: dict):
+        task = _WorkerTask(message)
+        try:
+            task = await agent.handle_task_async(task)
+            response = [request_id, True, task.artifacts]
+        except Exception as e:
+            logging.error(f"[{chef_name}] Error al procesar la tarea {request_id}: {e}")
+            response = [request_id, False, str(e)]
+        conn.send_bytes(_encode(response))
+
+    running = set()
+    try:
+        while True:
+            try:
+                data = await asyncio.to_thread(conn.recv_bytes)
+            except EOFError:
+                break
+            if data == _SHUTDOWN:
+                break
+            request_id, message = _decode(data)
+            handler = asyncio.create_task(handle(request_id, message))
+            running.add(handler)
+            handler.add_done_callback(running.discard)
+        if running:
+            await asyncio.gather(*running)
+    finally:
+        for name, stats in agent.kitchen.stats().items():
+            logging.info(f"[{chef_name}] Estación {name}: {stats['utilization']:.0%} de utilización, "
+                         f"espera promedio {stats['avg_wait']:.2f}s")
+        await cleanup_mcp_client()
+        conn.close()
+
+
+class _WorkerTask:
+    """Tarea mínima que recibe el agente dentro del worker"""
+
+    def __init__(self, message: dict):
+        self.message = message
+        self.artifacts = []
+        self.status = None
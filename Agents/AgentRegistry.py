@@ -0,0 +1,117 @@
+import itertools
+import random
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+class AgentReplica:
+    """Una instancia de un agente: local (en este proceso) o remota (por URL)"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name: str, agent=None, url: str | None = None):
+        if agent is None and url is None:
+            raise ValueError(f"La réplica de {name} necesita un agente local o una URL")
+        self.id = next(self._ids)
+        self.name = name
+        self.agent = agent
+        self.url = url or agent.agent_card.url
+        self.outstanding = 0
+        self.completed = 0
+        self.failed = 0
+        self.last_used = 0
+
+    @property
+    def is_local(self) -> bool:
+        return self.agent is not None
+
+
+class AgentRegistry:
+    """Réplicas por nombre de AgentCard con balanceo de carga
+
+    Estrategias:
+        least_outstanding: la réplica con menos tareas en curso (empates por
+            la que lleva más tiempo sin usarse)
+        p2c: power of two choices, compara dos réplicas al azar y elige la
+            menos ocupada; escala mejor con muchas réplicas y varios
+            balanceadores
+
+    Las réplicas se pueden agregar o quitar en cualquier momento; una réplica
+    quitada termina sus tareas en curso pero ya no recibe nuevas.
+    """
+
+    STRATEGIES = ("least_outstanding", "p2c")
+
+    def __init__(self, strategy: str = "least_outstanding", seed: int | None = None):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Estrategia de balanceo desconocida: {strategy}")
+        self.strategy = strategy
+        self._replicas: Dict[str, List[AgentReplica]] = {}
+        self._rng = random.Random(seed)
+        self._clock = itertools.count(1)
+
+    def add(self, name: str, agent=None, url: str | None = None) -> AgentReplica:
+        """Registra una réplica del agente name"""
+        replica = AgentReplica(name, agent, url)
+        self._replicas.setdefault(name, []).append(replica)
+        return replica
+
+    def remove(self, name: str, replica: AgentReplica) -> bool:
+        """Quita una réplica; devuelve False si no estaba registrada"""
+        replicas = self._replicas.get(name, [])
+        if replica not in replicas:
+            return False
+        replicas.remove(replica)
+        return True
+
+    def replicas(self, name: str) -> List[AgentReplica]:
+        return list(self._replicas.get(name, []))
+
+    def count(self, name: str) -> int:
+        return len(self._replicas.get(name, []))
+
+    def pick(self, name: str) -> AgentReplica:
+        """Elige la réplica que debe atender la siguiente tarea de name"""
+        replicas = self._replicas.get(name)
+        if not replicas:
+            raise LookupError(f"No hay réplicas registradas para {name}")
+        if len(replicas) == 1:
+            return replicas[0]
+        if self.strategy == "p2c":
+            candidates = self._rng.sample(replicas, 2)
+        else:
+            candidates = replicas
+        return min(candidates, key=lambda replica: (replica.outstanding, replica.last_used))
+
+    @contextmanager
+    def acquire(self, name: str):
+        """Elige una réplica y la cuenta como ocupada mientras dura el bloque"""
+        replica = self.pick(name)
+        replica.outstanding += 1
+        replica.last_used = next(self._clock)
+        try:
+            yield replica
+        except BaseException:
+            replica.failed += 1
+            raise
+        else:
+            replica.completed += 1
+        finally:
+            replica.outstanding -= 1
+
+    def stats(self) -> Dict[str, List[dict]]:
+        """Carga de cada réplica para monitoreo"""
+        return {
+            name: [
+                {
+                    "id": replica.id,
+                    "url": replica.url,
+                    "local": replica.is_local,
+                    "outstanding": replica.outstanding,
+                    "completed": replica.completed,
+                    "failed": replica.failed,
+                }
+                for replica in replicas
+            ]
+            for name, replicas in self._replicas.items()
+        }
@@ -0,0 +1,159 @@
+from python_a2a import A2AServer, TaskStatus, TaskState, AgentCard, AgentSkill
+from typing import List
+import asyncio
+import atexit
+import random
+import logging
+import threading
+from MCP.McpClient import get_mcp_client_pool, cleanup_mcp_client
+from Metrics.Metrics import metrics
+from Agents.PreparationExecutor import PreparationExecutor
+from Recipes.RecipeBook import ChefDefinition, Recipe
+from Recipes.Stations import Kitchen
+
+class ChefAgent(A2AServer):
+    """Agente cocinero genérico cuyas skills y recetas vienen del menú"""
+
+    def __init__(self, chef: ChefDefinition, url: str | None = None):
+        agent_card = AgentCard(
+            name=chef.name,
+            description=chef.description,
+            url=url or chef.url,
+            version=chef.version,
+            skills=[
+                AgentSkill(
+                    id=skill["id"],
+                    name=skill["name"],
+                    description=skill["description"],
+                    tags=skill.get("tags", []),
+                    examples=skill.get("examples", []),
+                )
+                for skill in chef.skills
+            ],
+            default_input_modes=["text"],
+            default_output_modes=["text"]
+        )
+
+        super().__init__(agent_card=agent_card)
+
+        self.chef = chef
+        self.mcp_client = None
+        # Estaciones (hornos, parrillas...) compartidas por todos los pedidos del agente
+        self.kitchen = Kitchen(chef.stations)
+
+        logging.info(f"{agent_card.name} inicializado")
+        logging.info(f"   └─ URL: {agent_card.url}")
+        logging.info(f"   └─ Skills: {len(agent_card.skills)}")
+        for skill in agent_card.skills:
+            logging.info(f"      • {skill.name}: {skill.description}")
+        logging.info(f"   └─ Recetas: {', '.join(recipe.name for recipe in chef.recipes)}")
+        if chef.stations:
+            logging.info(f"   └─ Estaciones: {', '.join(f'{name} x{capacity}' for name, capacity in chef.stations.items())}")
+
+    async def _ensure_mcp_connection(self):
+        """Asegura que hay una conexión MCP activa"""
+        if self.mcp_client is None:
+            self.mcp_client = await get_mcp_client_pool()
+            # Listar tools disponibles
+            await self.mcp_client.list_tools()
+
+    async def preparar(self, recipe: Recipe, ingredients: List[str] = None, order_id: str = ""):
+        """Prepara una receta paso a paso con llamadas MCP"""
+        if ingredients is None:
+            ingredients = recipe.ingredients
+
+        await self._ensure_mcp_connection()
+
+        logging.info(f"\n[{self.chef.name}] {recipe.messages.get('start', 'Comenzando preparación...')}")
+
+        # Pasos en paralelo según sus dependencias, con bitácora, validación y
+        # score MCP solapados; solo los pasos que usan ingredientes esperan la validación
+        executor = PreparationExecutor(self.mcp_client, self.chef.name, recipe.name, recipe.quality_type,
+                                       kitchen=self.kitchen)
+        resultado = await executor.run(recipe.steps, ingredients, order_id=order_id)
+        metrics.histogram("station_wait_seconds", "Espera por estaciones de cocina en cada preparación",
+                          agent=self.chef.name).record(resultado["station_wait"])
+
+        logging.info(f"[{self.chef.name}] {recipe.messages.get('ready', f'¡{recipe.name} listo!')}")
+        logging.info(f"[{self.chef.name}] {resultado['quality']}")
+
+        return {
+            "item": recipe.item,
+            "recipe": recipe.id,
+            "quality": random.choice(recipe.qualities),
+            "preparation_time": resultado["preparation_time"],
+            "station_wait": resultado["station_wait"],
+            "steps": resultado["steps"],
+            "ingredients": ingredients,
+            "details": recipe.details,
+            "mcp_quality_check": resultado["quality"]
+        }
+
+    async def handle_task_async(self, task):
+        """Maneja tareas asignadas por el orquestador"""
+        with metrics.track("chef_task", "Tareas atendidas por el agente", agent=self.chef.name):
+            return await self._handle_task(task)
+
+    async def _handle_task(self, task):
+        message_data = task.message or {}
+        content = message_data.get("content", {})
+        text = content.get("text", "") if isinstance(content, dict) else str(content)
+
+        logging.info(f"\n[{self.chef.name}] Tarea recibida: {text}")
+
+        recipe = self.chef.select_recipe(text)
+        order_id = message_data.get("metadata", {}).get("order_id", "")
+        resultado = await self.preparar(recipe, order_id=order_id)
+
+        details = "".join(f"  • {label}: {value}\n" for label, value in resultado["details"].items())
+        task.artifacts = [{
+            "parts": [{
+                "type": "text",
+                "text": f"{recipe.messages.get('done', f'{recipe.name} preparado!')}\n\n"
+                       f"Detalles:\n"
+                       f"  • Calidad: {resultado['quality']}\n"
+                       f"  • Tiempo: {resultado['preparation_time']:.1f}s\n"
+                       f"  • Ingredientes: {', '.join(resultado['ingredients'])}\n"
+                       f"{details}"
+                       f"  • MCP Quality Check: {'Completado ✓' if resultado['mcp_quality_check'] else 'No disponible'}"
+            }]
+        }]
+        task.status = TaskStatus(state=TaskState.COMPLETED)
+
+        return task
+
+    def handle_task(self, task):
+        """Versión síncrona de handle_task_async para compatibilidad con A2AServer
+        
+        Todas las llamadas corren en el mismo event loop de fondo: el pool MCP
+        queda ligado al loop donde se creó y debe seguir sirviendo entre llamadas.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run_coroutine_threadsafe(self.handle_task_async(task), _background_loop()).result()
+        raise RuntimeError("handle_task no puede usarse dentro de un event loop activo, usa handle_task_async")
+
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Event loop persistente en un hilo aparte para las llamadas síncronas a handle_task"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="chef-agent-loop", daemon=True).start()
+            atexit.register(_stop_background_loop)
+        return _loop
+
+
+def _stop_background_loop():
+    """Cierra las conexiones MCP del loop de fondo y lo detiene al salir"""
+    try:
+        asyncio.run_coroutine_threadsafe(cleanup_mcp_client(), _loop).result(timeout=10)
+    except Exception as e:
+        logging.error(f"Error al cerrar las conexiones MCP del loop de fondo: {e}")
+    _loop.call_soon_threadsafe(_loop.stop)
@@ -0,0 +1,143 @@
+import argparse
+import logging
+import os
+import sys
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+from Metrics.Metrics import metrics
+from Recipes.RecipeBook import RecipeBook, DEFAULT_MENU_DIR
+
+# python_a2a, el agente y el cliente MCP se importan dentro de las funciones:
+# cada worker de uvicorn vuelve a importar este módulo al arrancar y, con los
+# importes pesados aquí, tardaba más que el health check del supervisor.
+
+
+def create_app(agent: "ChefAgent") -> Starlette:
+    """Aplicación ASGI que expone un agente cocinero con los endpoints A2A
+
+    GET  /agent.json, /a2a/agent.json, /.well-known/agent.json: AgentCard
+    POST /tasks/send, /a2a/tasks/send: ejecuta una tarea (directa o JSON-RPC)
+    GET  /a2a/health: estado del servicio
+    GET  /metrics: métricas del worker en formato Prometheus (?format=json para JSON)
+    """
+    from python_a2a import Task
+    from MCP.McpClient import cleanup_mcp_client
+
+    async def agent_card(request: Request) -> JSONResponse:
+        return JSONResponse(agent.agent_card.to_dict())
+
+    async def tasks_send(request: Request) -> JSONResponse:
+        try:
+            data = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "JSON inválido"}, status_code=400)
+        if not isinstance(data, dict):
+            return JSONResponse({"error": "la tarea debe ser un objeto JSON"}, status_code=400)
+
+        rpc_id = data.get("id", 1) if "jsonrpc" in data else None
+        params = data.get("params", {}) if rpc_id is not None else data
+        if not isinstance(params, dict):
+            return JSONResponse({"error": "params debe ser un objeto JSON"}, status_code=400)
+        task = Task(message=params.get("message"), metadata=params.get("metadata", {}))
+        if params.get("id"):
+            task.id = params["id"]
+
+        try:
+            task = await agent.handle_task_async(task)
+        except Exception as e:
+            logging.error(f"[{agent.agent_card.name}] Error al procesar la tarea {task.id}: {e}")
+            error = {"code": -32603, "message": f"Internal error: {e}"}
+            if rpc_id is not None:
+                return JSONResponse({"jsonrpc": "2.0", "id": rpc_id, "error": error}, status_code=500)
+            return JSONResponse({"error": error["message"]}, status_code=500)
+
+        if rpc_id is not None:
+            return JSONResponse({"jsonrpc": "2.0", "id": rpc_id, "result": task.to_dict()})
+        return JSONResponse(task.to_dict())
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok", "agent": agent.agent_card.name, "pid": os.getpid()})
+
+    async def metrics_endpoint(request: Request) -> Response:
+        if request.query_params.get("format") == "json":
+            return JSONResponse(metrics.to_dict())
+        return PlainTextResponse(metrics.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        # Cada worker tiene su propio pool MCP
+        await cleanup_mcp_client()
+
+    return Starlette(
+        routes=[
+            Route("/agent.json", agent_card, methods=["GET"]),
+            Route("/a2a/agent.json", agent_card, methods=["GET"]),
+            Route("/.well-known/agent.json", agent_card, methods=["GET"]),
+            Route("/tasks/send", tasks_send, methods=["POST"]),
+            Route("/a2a/tasks/send", tasks_send, methods=["POST"]),
+            Route("/a2a/health", health, methods=["GET"]),
+            Route("/metrics", metrics_endpoint, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def app_from_env() -> Starlette:
+    """Fábrica para uvicorn: cada worker arma su agente a partir de CHEF_NAME y CHEF_MENU_DIR"""
+    from Agents.ChefAgent import ChefAgent
+    book = RecipeBook.from_directory(os.getenv("CHEF_MENU_DIR", DEFAULT_MENU_DIR))
+    chef = book.get_chef(os.environ["CHEF_NAME"])
+    if chef is None:
+        raise ValueError(f"No hay un agente llamado {os.environ['CHEF_NAME']} en el menú")
+    return create_app(ChefAgent(chef, url=os.getenv("CHEF_URL")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sirve un agente cocinero por HTTP (A2A)")
+    parser.add_argument("--chef", required=True, help='Nombre del agente en el menú, p. ej. "Pizza Artisan"')
+    parser.add_argument("--menu-dir", default=DEFAULT_MENU_DIR, help="Directorio con los archivos de menú")
+    parser.add_argument("--host", default=None, help="Host (por defecto el de la URL del AgentCard)")
+    parser.add_argument("--port", type=int, default=None, help="Puerto (por defecto el de la URL del AgentCard)")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos que atienden peticiones")
+    parser.add_argument("--keep-alive", type=int, default=30, help="Segundos que se mantienen abiertas las conexiones")
+    parser.add_argument("--healthcheck-timeout", type=int, default=30,
+                        help="Segundos que el supervisor espera a que un worker responda antes de reiniciarlo")
+    args = parser.parse_args()
+
+    chef = RecipeBook.from_directory(args.menu_dir).get_chef(args.chef)
+    if chef is None:
+        parser.error(f"No hay un agente llamado {args.chef} en el menú")
+    url = urlparse(chef.url)
+    host = args.host or url.hostname or "127.0.0.1"
+    port = args.port or url.port or 80
+
+    # Los workers heredan el entorno y arman cada uno su propio agente
+    os.environ["CHEF_NAME"] = args.chef
+    os.environ["CHEF_MENU_DIR"] = args.menu_dir
+    os.environ["CHEF_URL"] = f"http://{host}:{port}"
+
+    logging.info(f"Sirviendo {args.chef} en http://{host}:{port} con {args.workers} workers")
+    uvicorn.run(
+        "Agents.ChefServer:app_from_env",
+        factory=True,
+        host=host,
+        port=port,
+        workers=args.workers,
+        timeout_keep_alive=args.keep_alive,
+        timeout_worker_healthcheck=args.healthcheck_timeout,
+        log_level="warning",
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    main()
@@ -1,25 +1,118 @@
-from python_a2a import AgentNetwork
+from python_a2a import AgentNetwork, TaskState
 from langchain_community.chat_models import ChatOpenAI
 from dotenv import load_dotenv
 import asyncio
+import json
 import logging
 import os
-from typing import List, Dict
-from Agents.HamburguerAgent import HamburguesaAgent
-from Agents.PizzaAgent import PizzaAgent
-from Agents.HotDogAgent import HotDogAgent
-from Prompts.PromptTemplates import orchestrator_prompt_template
+import re
+import shutil
+import tempfile
+import time
+from typing import AsyncIterator, List, Dict
+from Agents.A2AHttpClient import A2AHttpClient
+from Agents.AdmissionControl import Admission, AdmissionControl
+from Agents.AgentProcess import AgentProcess
+from Agents.AgentRegistry import AgentRegistry, AgentReplica
+from Agents.ChefAgent import ChefAgent
+from Agents.OrderQueue import OrderQueue, parse_urgency
+from Metrics.Metrics import metrics, Histogram
+from Recipes.RecipeBook import RecipeBook, DEFAULT_MENU_DIR
+from Prompts.PromptTemplates import orchestrator_prompt_template, orchestrator_batch_prompt_template
+from Routing.AgentCardRenderer import AgentCardRenderer
+from Routing.RequestCoalescer import RequestCoalescer
+from Routing.RoutingCache import RoutingCache
+from Routing.SkillRouter import SkillRouter
+from Routing.TokenCounter import count_tokens
+
+
+class SimpleTask:
+    """Tarea mínima compatible con el handle_task de los agentes A2A"""
+
+    def __init__(self):
+        self.message = None
+        self.status = None
+        self.artifacts = []
 
 
 class RestaurantOrchestrator():
     """Orquestador que coordina los agentes usando AgentCards y Skills"""
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 4, max_per_agent: int = 2,
+                 routing_cache_size: int = 1024, routing_cache_ttl: float = 3600.0,
+                 use_local_routing: bool = True, batch_routing: bool = True,
+                 menu_dir: str = DEFAULT_MENU_DIR, dispatch_policy: str = "edf",
+                 max_queue_wait: float = 30.0, dispatch: str = "local",
+                 replicas_per_agent: int = 1, balancing: str = "least_outstanding",
+                 max_queue_per_agent: int | None = None, overload_policy: str = "reject",
+                 default_agent: str | None = None, worker_mcp_pool_size: int = 1):
         load_dotenv()
         self.network = AgentNetwork(name="Restaurant Agent Network")
         self.agents = {}  
         self.completed_orders = []
 
+        # "local": los agentes corren en este proceso; "process": cada réplica corre
+        # en su propio proceso worker; "http": las tareas se envían a agent_card.url
+        # de cada agente (ver Agents/ChefServer.py)
+        if dispatch not in ("local", "process", "http"):
+            raise ValueError(f"Modo de despacho desconocido: {dispatch}")
+        self.dispatch = dispatch
+        self.http_client = A2AHttpClient() if dispatch == "http" else None
+
+        # Réplicas de cada agente (locales o en otras URLs) y cómo repartir las tareas
+        self.registry = AgentRegistry(balancing)
+        self.replicas_per_agent = replicas_per_agent
+        self.processes: List[AgentProcess] = []
+        self._retiring: set[asyncio.Task] = set()
+
+        # Los procesos worker comparten una base de inventario (la de MCP_INVENTORY_DB o
+        # una temporal que crea el orquestador) y cada uno abre un pool MCP pequeño
+        self.worker_mcp_pool_size = worker_mcp_pool_size
+        self._inventory_dir: str | None = None
+
+        # Menú declarativo: recetas y AgentCards se leen y validan una sola vez
+        self.menu_dir = menu_dir
+        self.recipe_book = RecipeBook.from_directory(menu_dir)
+
+        # Límites para el procesamiento concurrente de pedidos
+        self.max_concurrency = max_concurrency
+        self.max_per_agent = max_per_agent
+
+        # Orden de despacho de los pedidos en espera (fifo, edf o sjf) y espera
+        # máxima antes de adelantar un pedido para evitar inanición
+        self.dispatch_policy = dispatch_policy
+        self.max_queue_wait = max_queue_wait
+
+        # Control de admisión: pedidos en espera por agente y qué hacer con el
+        # excedente (reject, shed o degrade hacia default_agent)
+        if default_agent is not None and self.recipe_book.get_chef(default_agent) is None:
+            raise ValueError(f"No hay un agente llamado {default_agent} en el menú")
+        self.max_queue_per_agent = max_queue_per_agent
+        self.overload_policy = overload_policy
+        self.default_agent = default_agent
+        self.admission_counts: Dict[str, int] = {}
+
+        # Cache de decisiones de routing para no repetir llamadas al LLM
+        self.routing_cache = RoutingCache(max_size=routing_cache_size, ttl=routing_cache_ttl)
+
+        # Router local por tags/ejemplos de las skills, antes de recurrir al LLM
+        self.use_local_routing = use_local_routing
+        self.skill_router = SkillRouter()
+
+        # En modo concurrente, clasificar todos los pedidos pendientes en una sola llamada al LLM
+        self.batch_routing = batch_routing
+
+        # Pedidos idénticos en vuelo comparten una sola llamada al LLM
+        self.routing_coalescer = RequestCoalescer()
+
+        # Texto compacto de los AgentCards para los prompts, renderizado al registrar agentes
+        self.card_renderer = AgentCardRenderer()
+        self.prompt_tokens = {"prompts": 0, "total": 0, "last": 0}
+        self._prompt_base_tokens = {
+            "single": self._template_tokens(orchestrator_prompt_template, user_prompt="", AgentCards=""),
+            "batch": self._template_tokens(orchestrator_batch_prompt_template, orders="", AgentCards=""),
+        }
+
         self.llm = ChatOpenAI(
             model="gpt-3.5-turbo",
             api_key = os.getenv("OPENAI_API_KEY"),
@@ -34,94 +127,746 @@ class RestaurantOrchestrator():
         logging.info("")
         logging.info("Configurando agentes especializados con AgentCard y AgentSkill...\n")
         
-        hamburguesa_agent = HamburguesaAgent(url="http://localhost:5001")
-        hotdog_agent = HotDogAgent(url="http://localhost:5002")
-        pizza_agent = PizzaAgent(url="http://localhost:5003")
-        
-        # Guardar referencias con acceso a AgentCard
-        self.agents = {
-            "Hamburguesa Chef": hamburguesa_agent,
-            "Hot Dog Master": hotdog_agent,
-            "Pizza Artisan": pizza_agent
-        }
+        # Un agente cocinero por cada archivo del menú; referencias con acceso a AgentCard
+        self.agents = {chef.name: ChefAgent(chef) for chef in self.recipe_book.chefs}
         
-        # Registrar en la red
+        # Registrar en la red y como primera réplica de cada nombre
         for name, agent in self.agents.items():
             self.network.add(name, agent.agent_card.url)
+            if self.dispatch == "process":
+                # El agente local solo aporta el AgentCard; las tareas van a los workers
+                for _ in range(self.replicas_per_agent):
+                    self.add_replica(name)
+                continue
+            self.registry.add(name, agent)
+            # Réplicas locales extra; en modo http las réplicas se agregan por URL
+            if self.dispatch == "local":
+                for _ in range(self.replicas_per_agent - 1):
+                    self.add_replica(name)
+
+        # Invalidar decisiones de routing tomadas con otro conjunto de agentes
+        if self.routing_cache.set_fingerprint(RoutingCache.fingerprint_agents(self.agents)):
+            logging.info("Cache de routing reiniciado para los agentes registrados")
+        self.skill_router.build_index(self.agents)
+        self.card_renderer.update(self.agents)
+        logging.info(f"AgentCards para routing: {self.card_renderer.tokens} tokens")
         
         logging.info("")
-        return hamburguesa_agent, hotdog_agent, pizza_agent
+        return tuple(self.agents.values())
     
 
-    async def process_orders_with_llm_routing(self, orders: List[Dict]):
-        """Procesa pedidos con enrutamiento inteligente basado en AgentCards"""
+    def add_replica(self, name: str, url: str | None = None) -> AgentReplica:
+        """Agrega en caliente una réplica del agente name
+        
+        Sin url se crea un agente local nuevo (con sus propias estaciones), en
+        este proceso o en un proceso worker según el modo de despacho; con url
+        las tareas de esa réplica se envían por HTTP.
+        """
+        chef = self.recipe_book.get_chef(name)
+        if chef is None:
+            raise ValueError(f"No hay un agente llamado {name} en el menú")
+        if url:
+            agent = None
+        elif self.dispatch == "process":
+            agent = AgentProcess(name, self.menu_dir, agent_card=self.agents[name].agent_card,
+                                 env=self._worker_env())
+            agent.start()
+            self.processes.append(agent)
+        else:
+            agent = ChefAgent(chef)
+        replica = self.registry.add(name, agent, url)
+        logging.info(f"Réplica {replica.id} de {name} agregada ({replica.url})")
+        return replica
+
+    def remove_replica(self, name: str, replica: AgentReplica) -> bool:
+        """Quita una réplica; termina sus tareas en curso pero no recibe nuevas
+        
+        Si la réplica es un proceso worker, se detiene (junto con sus
+        servidores MCP) en cuanto termina esas tareas; sin un event loop
+        corriendo, se detiene en close(). La última réplica de un agente no se
+        puede quitar: sus pedidos seguirían admitiéndose y fallarían al
+        despacharse.
+        """
+        if replica in self.registry.replicas(name) and self.registry.count(name) == 1:
+            raise ValueError(f"No se puede quitar la última réplica de {name}")
+        removed = self.registry.remove(name, replica)
+        if removed:
+            logging.info(f"Réplica {replica.id} de {name} retirada")
+            if isinstance(replica.agent, AgentProcess):
+                try:
+                    task = asyncio.get_running_loop().create_task(self._retire_process(replica))
+                except RuntimeError:
+                    pass
+                else:
+                    self._retiring.add(task)
+                    task.add_done_callback(self._retiring.discard)
+        return removed
+
+    async def _retire_process(self, replica: AgentReplica):
+        """Detiene el proceso worker de una réplica retirada cuando termina sus tareas en curso"""
+        while replica.outstanding:
+            await asyncio.sleep(0.1)
+        process = replica.agent
+        if process in self.processes:
+            self.processes.remove(process)
+            await process.aclose()
+            logging.info(f"Proceso worker de la réplica {replica.id} de {replica.name} detenido")
+
+    async def process_orders_with_llm_routing(self, orders: List[Dict], policy: str = None):
+        """Procesa pedidos con enrutamiento inteligente basado en AgentCards
+        
+        Los pedidos se enrutan primero y luego se preparan uno a uno en el
+        orden que dicta la política de despacho.
+        
+        Args:
+            orders: Lista de pedidos con "id", "description" y opcionalmente
+                "priority" ("delivery" o "dine-in") y "deadline" (segundos)
+            policy: Política de despacho (por defecto la del orquestador)
+        """
         logging.info("\n" + "=" * 70)
         logging.info("PROCESAMIENTO DE PEDIDOS CON ROUTING INTELIGENTE")
         logging.info("=" * 70)
         logging.info("")
         
-        for i, order in enumerate(orders, 1):
+        queue = self._new_order_queue(policy)
+        # Un pedido a la vez: cada agente tiene un solo lugar de ejecución
+        admission = self._new_admission(queue, 1)
+        pending, records = self._validate_orders(orders)
+        for i, order in pending.items():
             logging.info(f"\n{'─' * 70}")
             logging.info(f"PEDIDO #{i}: {order['description']}")
             logging.info(f"{'─' * 70}")
             
             logging.info(f"\nAnalizando capacidades de agentes...")
 
-            order_description = order['description']
-
-            agent_cards_info = []
-
-            for name, agent in self.agents.items():
-                card = agent.agent_card
-                agent_cards_info.append(card)
-
-            # Para obtener el nombre del agente dinamicamente por medio de LLM
-            chain = orchestrator_prompt_template | self.llm
-            response = chain.invoke({
-                "user_prompt": order_description,
-                "AgentCards": agent_cards_info
-            })
-
-            response = response.content
-
-            logging.info(f"System response for Orchestrator:\n{response}\n")
-
+            try:
+                response = await self._route_order(order['description'])
+            except Exception as e:
+                logging.error(f"PEDIDO #{i}: no se pudo enrutar: {e}")
+                records[i] = self._build_failed_record(i, order, e)
+                continue
             agent = self.agents[response]
             logging.info(f"EL MEJOR AGENTES ES: {agent}")
-            agent_card = agent.agent_card
-            
-            logging.info(f"Agent Card: {agent_card.name}")
-            logging.info(f"   └─ Skills disponibles: {len(agent_card.skills)}")
-            for skill in agent_card.skills:
-                logging.info(f"      • {skill.name} ({', '.join(skill.tags)})")
-            
-            # Crear y procesar tarea
-            class SimpleTask:
-                def __init__(self):
-                    self.message = None
-                    self.status = None
-                    self.artifacts = []
-            
-            task = SimpleTask()
-            task.message = {"content": {"text": order['description']}}
+            self._log_agent_card(agent.agent_card)
+            _, rejected = self._admit(admission, i, order, response)
+            for record in rejected:
+                records[record["order_id"]] = record
+        
+        while queue:
+            entry = queue.pop()
+            logging.info(f"\nPreparando PEDIDO #{entry.order_id} ({entry.agent})")
             
             # Procesar tarea
-            result_task = agent.handle_task(task)
+            admission.started(entry)
+            try:
+                result_task = await self._execute_task(entry.agent, self._build_task(entry.order['description'], entry.order_id))
+                record = self._build_order_record(entry.order_id, entry.order, entry.agent, result_task, entry)
+            except Exception as e:
+                # Un pedido que falla no impide preparar los siguientes ni pierde sus resultados
+                logging.error(f"PEDIDO #{entry.order_id}: falló la preparación: {e}")
+                record = self._build_failed_record(entry.order_id, entry.order, e, entry.agent)
+            finally:
+                admission.finished(entry)
             
             # Guardar resultado
-            self.completed_orders.append({
-                "order_id": i,
-                "description": order['description'],
-                "agent": response,
-                "agent_card": agent_card.name,
-                "skills_used": [skill.name for skill in agent_card.skills],
-                "status": "completed",
-                "result": result_task.artifacts[0]["parts"][0]["text"] if result_task.artifacts else "N/A"
-            })
+            records[entry.order_id] = record
             
             await asyncio.sleep(0.5)
         
+        self.completed_orders.extend(records[i] for i in sorted(records))
         self._print_summary()
+
+    async def process_orders_concurrently(self, orders: List[Dict], max_concurrency: int = None, max_per_agent: int = None,
+                                          policy: str = None):
+        """Procesa pedidos en paralelo respetando límites global y por agente
+        
+        Todos los pedidos se enrutan primero y entran a una cola de despacho;
+        cada vez que se libera un lugar se toma el mejor pedido según la
+        política cuyo agente tenga capacidad libre. Los resultados se agregan
+        a completed_orders en el orden de llegada, sin importar el orden en
+        que terminan.
+        
+        Args:
+            orders: Lista de pedidos con "id", "description" y opcionalmente
+                "priority" ("delivery" o "dine-in") y "deadline" (segundos)
+            max_concurrency: Pedidos simultáneos como máximo (por defecto el del orquestador)
+            max_per_agent: Tareas simultáneas por réplica de agente (por defecto el del orquestador)
+            policy: Política de despacho (por defecto la del orquestador)
+        """
+        logging.info("\n" + "=" * 70)
+        logging.info("PROCESAMIENTO CONCURRENTE DE PEDIDOS CON ROUTING INTELIGENTE")
+        logging.info("=" * 70)
+        logging.info("")
+
+        concurrency = max_concurrency or self.max_concurrency
+        per_agent = max_per_agent or self.max_per_agent
+
+        pending, records = self._validate_orders(orders)
+        routes = {}
+        if self.batch_routing and len(pending) > 1:
+            logging.info(f"Analizando capacidades de agentes para {len(pending)} pedidos en lote...")
+            batch = await self._route_orders_batch([order['description'] for order in pending.values()])
+            routes = dict(zip(pending, batch))
+
+        routing_limit = asyncio.Semaphore(concurrency)
+
+        async def route(i: int, order: Dict) -> str | Exception:
+            if routes.get(i) is not None:
+                return routes[i]
+            async with routing_limit:
+                logging.info(f"PEDIDO #{i}: {order['description']} → analizando capacidades de agentes...")
+                try:
+                    return await self._route_order(order['description'])
+                except Exception as e:
+                    return e
+
+        assigned = await asyncio.gather(*(route(i, order) for i, order in pending.items()))
+
+        queue = self._new_order_queue(policy)
+        admission = self._new_admission(queue, per_agent)
+        for (i, order), response in zip(pending.items(), assigned):
+            # Un pedido que no se pudo enrutar queda como fallido sin afectar a los demás
+            if isinstance(response, Exception):
+                logging.error(f"PEDIDO #{i}: no se pudo enrutar: {response}")
+                records[i] = self._build_failed_record(i, order, response)
+                continue
+            _, rejected = self._admit(admission, i, order, response)
+            for record in rejected:
+                records[record["order_id"]] = record
+
+        running = {name: 0 for name in self.agents}
+        slot_freed = asyncio.Condition()
+
+        async def worker():
+            while True:
+                # Siguiente pedido cuyo agente tenga lugar; si no hay, esperar a que se libere uno
+                async with slot_freed:
+                    while True:
+                        if not queue:
+                            return
+                        entry = queue.pop(lambda entry: running[entry.agent] < per_agent * max(1, self.registry.count(entry.agent)))
+                        if entry is not None:
+                            break
+                        await slot_freed.wait()
+                    running[entry.agent] += 1
+                    admission.started(entry)
+
+                agent = self.agents[entry.agent]
+                logging.info(f"PEDIDO #{entry.order_id} asignado a {agent.agent_card.name}")
+                try:
+                    result_task = await self._execute_task(entry.agent, self._build_task(entry.order['description'], entry.order_id))
+                    record = self._build_order_record(entry.order_id, entry.order, entry.agent, result_task, entry)
+                except Exception as e:
+                    # Un pedido que falla no detiene a los demás workers ni pierde sus resultados
+                    logging.error(f"PEDIDO #{entry.order_id}: falló la preparación: {e}")
+                    record = self._build_failed_record(entry.order_id, entry.order, e, entry.agent)
+                finally:
+                    async with slot_freed:
+                        admission.finished(entry)
+                        running[entry.agent] -= 1
+                        slot_freed.notify_all()
+
+                records[entry.order_id] = record
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(pending)))))
+        self.completed_orders.extend(records[i] for i in sorted(records))
+
+        self._print_summary()
+
+    async def stream_orders(self, source: AsyncIterator[Dict], max_concurrency: int = None,
+                            max_per_agent: int = None, policy: str = None) -> AsyncIterator[Dict]:
+        """Procesa pedidos conforme llegan y entrega cada resultado en cuanto termina
+        
+        Pensado para correr como servicio: los pedidos se leen de la fuente
+        (ver Agents/OrderSources.py), se enrutan y entran a la cola de
+        despacho mientras otros se preparan. Termina cuando la fuente se
+        agota y no quedan pedidos pendientes; con una fuente infinita corre
+        indefinidamente. Se enrutan como máximo max_concurrency pedidos a la
+        vez y, mientras no haya lugar, no se leen pedidos nuevos de la fuente.
+        Los resultados no se acumulan en completed_orders.
+        
+        Al entrar a la cola, cada pedido produce un aviso con status
+        "accepted" o "degraded", el agente asignado y estimated_wait; su
+        resultado llega después en otro registro. Un pedido que el control de
+        admisión deja fuera produce un registro "rejected", y uno que falla un
+        registro "failed", sin detener el resto.
+        
+        Args:
+            source: Iterador asíncrono de pedidos con "description"
+            max_concurrency: Pedidos simultáneos como máximo (por defecto el del orquestador)
+            max_per_agent: Tareas simultáneas por réplica de agente (por defecto el del orquestador)
+            policy: Política de despacho (por defecto la del orquestador)
+        """
+        concurrency = max_concurrency or self.max_concurrency
+        per_agent = max_per_agent or self.max_per_agent
+
+        queue = self._new_order_queue(policy)
+        admission = self._new_admission(queue, per_agent)
+        running = {name: 0 for name in self.agents}
+        changed = asyncio.Condition()
+        completed: asyncio.Queue = asyncio.Queue()
+        routing_limit = asyncio.Semaphore(concurrency)
+        state = {"routing": 0, "intake_done": False}
+        admissions = set()
+
+        async def admit(i: int, order: Dict):
+            """Enruta un pedido y lo deja en la cola de despacho; libera el lugar que tomó intake"""
+            records = []
+            try:
+                try:
+                    self._check_order(order)
+                    response = await self._route_order(order['description'])
+                finally:
+                    routing_limit.release()
+                async with changed:
+                    result, records = self._admit(admission, i, order, response)
+                if result.accepted:
+                    # El aviso de admisión sale en cuanto el pedido entra a la cola
+                    records.insert(0, self._build_admission_record(i, order, result))
+            except Exception as e:
+                logging.error(f"PEDIDO #{i}: no se pudo admitir: {e}")
+                records = [self._build_failed_record(i, order if isinstance(order, dict) else {}, e)]
+            finally:
+                # Siempre avisar a los workers, o podrían esperar para siempre al último pedido
+                async with changed:
+                    state["routing"] -= 1
+                    changed.notify_all()
+            for record in records:
+                await completed.put(record)
+
+        async def intake():
+            i = 0
+            orders = aiter(source)
+            try:
+                while True:
+                    # No se lee el siguiente pedido hasta que haya lugar para enrutarlo: así
+                    # la fuente retiene lo que no se alcanza a atender (p. ej. http_orders
+                    # responde 503 cuando se llena su cola de entrada)
+                    await routing_limit.acquire()
+                    try:
+                        order = await anext(orders)
+                    except BaseException:
+                        routing_limit.release()
+                        raise
+                    i += 1
+                    async with changed:
+                        state["routing"] += 1
+                    task = asyncio.create_task(admit(i, order))
+                    admissions.add(task)
+                    task.add_done_callback(admissions.discard)
+            except StopAsyncIteration:
+                pass
+            except Exception as e:
+                logging.error(f"Error leyendo la fuente de pedidos: {e}")
+            finally:
+                async with changed:
+                    state["intake_done"] = True
+                    changed.notify_all()
+
+        async def worker():
+            while True:
+                async with changed:
+                    while True:
+                        entry = queue.pop(lambda entry: running[entry.agent] < per_agent * max(1, self.registry.count(entry.agent)))
+                        if entry is not None:
+                            break
+                        if state["intake_done"] and not state["routing"] and not queue:
+                            return
+                        await changed.wait()
+                    running[entry.agent] += 1
+                    admission.started(entry)
+
+                agent = self.agents[entry.agent]
+                logging.info(f"PEDIDO #{entry.order_id} asignado a {agent.agent_card.name}")
+                try:
+                    result_task = await self._execute_task(entry.agent, self._build_task(entry.order['description'], entry.order_id))
+                    record = self._build_order_record(entry.order_id, entry.order, entry.agent, result_task, entry)
+                except Exception as e:
+                    logging.error(f"PEDIDO #{entry.order_id}: falló la preparación: {e}")
+                    record = self._build_failed_record(entry.order_id, entry.order, e, entry.agent)
+                finally:
+                    async with changed:
+                        admission.finished(entry)
+                        running[entry.agent] -= 1
+                        changed.notify_all()
+                await completed.put(record)
+
+        async def finish():
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            await completed.put(None)
+
+        tasks = [asyncio.create_task(intake()), asyncio.create_task(finish())]
+        try:
+            while (record := await completed.get()) is not None:
+                yield record
+        finally:
+            # Si el consumidor deja de iterar, se detiene la ingesta y se cancela lo pendiente
+            pending = [*tasks, *admissions]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _route_order(self, order_description: str) -> str:
+        """Obtiene el nombre del agente más adecuado para el pedido
+        
+        Primero intenta el router local por skills; solo si la decisión no es
+        confiable consulta el cache y, en último caso, el LLM. Las consultas
+        idénticas que ya están en vuelo se comparten en lugar de repetirse.
+        """
+        with metrics.track("routing", "Decisiones de routing", mode="single"):
+            known = self._route_without_llm(order_description)
+            if known is not None:
+                return known
+
+            # Solo quien lanza la consulta la cuenta como llm; los que se unen a ella, como coalesced
+            asked = []
+
+            def ask():
+                asked.append(True)
+                return self._route_with_llm(order_description)
+
+            key = (RoutingCache.normalize(order_description), self.routing_cache.fingerprint)
+            agent_name = await self.routing_coalescer.run(key, ask)
+            return self._checked_agent(agent_name, "llm" if asked else "coalesced")
+
+    def _checked_agent(self, agent_name: str, source: str) -> str:
+        """Valida el agente que eligió el LLM; uno desconocido va al agente por defecto o es un error
+        
+        Las decisiones válidas se cuentan con su origen, y las que terminan en
+        el agente por defecto, como default.
+        """
+        if agent_name in self.agents:
+            self._count_route(source)
+            return agent_name
+        if self.default_agent is not None:
+            logging.warning(f"El LLM eligió un agente desconocido ({agent_name!r}), se usa {self.default_agent}")
+            self._count_route("default")
+            return self.default_agent
+        raise ValueError(f"El LLM eligió un agente desconocido: {agent_name!r}")
+
+    async def _route_with_llm(self, order_description: str) -> str:
+        """Consulta al LLM el agente para un pedido y cachea la respuesta válida"""
+        # Para obtener el nombre del agente dinamicamente por medio de LLM
+        self._record_prompt_tokens("single", order_description)
+        chain = orchestrator_prompt_template | self.llm
+        with metrics.track("llm_routing", "Llamadas al LLM de routing", mode="single"):
+            response = await chain.ainvoke({
+                "user_prompt": order_description,
+                "AgentCards": self._agent_cards_info()
+            })
+
+        # Los ejemplos few-shot traen espacios alrededor del nombre; el modelo los imita
+        response = response.content.strip()
+
+        logging.info(f"System response for Orchestrator:\n{response}\n")
+
+        # Solo se cachean respuestas que corresponden a un agente registrado
+        if response in self.agents:
+            self.routing_cache.put(order_description, response)
+
+        return response
+
+    async def _route_orders_batch(self, descriptions: List[str]) -> List[str | Exception]:
+        """Obtiene el agente de varios pedidos con una sola llamada al LLM
+        
+        Los pedidos que se resuelven localmente o desde cache no se envían al
+        LLM. Si la respuesta del lote no trae un agente válido para algún
+        pedido, ese pedido se enruta individualmente; si tampoco así se
+        obtiene un agente válido, en su lugar queda la excepción.
+        """
+        with metrics.track("routing", "Decisiones de routing", mode="batch"):
+            routes, retry = await self._route_batch(descriptions)
+
+        # Los reintentos individuales se lanzan en paralelo; cada uno se mide como routing de un pedido
+        retried = await asyncio.gather(*(self._route_order(descriptions[group[0]]) for group in retry),
+                                       return_exceptions=True)
+        for group, agent_name in zip(retry, retried):
+            for i in group:
+                routes[i] = agent_name
+
+        return routes
+
+    async def _route_batch(self, descriptions: List[str]) -> tuple[List[str | None], List[List[int]]]:
+        """Enruta el lote sin reintentos; devuelve las rutas y los grupos de pedidos por reintentar"""
+        routes = [self._route_without_llm(description) for description in descriptions]
+
+        # Descripciones equivalentes se envían una sola vez al LLM
+        pending = {}
+        for i, route in enumerate(routes):
+            if route is None:
+                pending.setdefault(RoutingCache.normalize(descriptions[i]), []).append(i)
+        if not pending:
+            return routes, []
+
+        groups = list(pending.values())
+        orders_text = "\n".join(f"{n}. {descriptions[group[0]]}" for n, group in enumerate(groups, 1))
+        self._record_prompt_tokens("batch", orders_text)
+        chain = orchestrator_batch_prompt_template | self.llm
+        try:
+            with metrics.track("llm_routing", "Llamadas al LLM de routing", mode="batch"):
+                response = (await chain.ainvoke({
+                    "orders": orders_text,
+                    "AgentCards": self._agent_cards_info()
+                })).content
+            logging.info(f"System response for Orchestrator (lote de {len(groups)}):\n{response}\n")
+            assignments = self._parse_batch_routing(response)
+        except Exception as e:
+            logging.error(f"Error en routing por lote, se enruta cada pedido por separado: {e}")
+            assignments = {}
+
+        retry = []
+        for n, group in enumerate(groups, 1):
+            description = descriptions[group[0]]
+            agent_name = assignments.get(n)
+            if agent_name in self.agents:
+                self.routing_cache.put(description, agent_name)
+                self._count_route("llm", len(group))
+                for i in group:
+                    routes[i] = agent_name
+            else:
+                logging.warning(f"Routing por lote inválido para el pedido {n} ({agent_name!r}), reintentando individualmente")
+                retry.append(group)
+
+        return routes, retry
+
+    def _route_without_llm(self, order_description: str) -> str | None:
+        """Resuelve el agente con el router local o el cache, sin llamar al LLM"""
+        if self.use_local_routing:
+            local = self.skill_router.route(order_description)
+            if local is not None:
+                logging.info(f"Routing local por skills: {local}")
+                self._count_route("skill")
+                return local
+
+        cached = self.routing_cache.get(order_description)
+        if cached is not None:
+            logging.info(f"Routing desde cache: {cached}")
+            self._count_route("cache")
+            return cached
+
+        return None
+
+    @staticmethod
+    def _count_route(source: str, amount: int = 1):
+        """Cuenta decisiones de routing por origen: skill, cache, llm, coalesced o default"""
+        metrics.counter("routing_decisions_total", "Decisiones de routing por origen", source=source).inc(amount)
+
+    @staticmethod
+    def _parse_batch_routing(response: str) -> Dict[int, str]:
+        """Interpreta la respuesta JSON del routing por lote como {número de pedido: agente}"""
+        match = re.search(r"\{.*\}|\[.*\]", response, re.DOTALL)
+        if match is None:
+            return {}
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+
+        if isinstance(data, list):
+            data = {str(n): name for n, name in enumerate(data, 1)}
+
+        assignments = {}
+        for key, name in data.items():
+            if str(key).strip().isdigit() and isinstance(name, str):
+                assignments[int(key)] = name.strip()
+        return assignments
+
+    def _agent_cards_info(self) -> str:
+        """AgentCards de los agentes registrados, tal como se pasan al prompt de routing"""
+        return self.card_renderer.text
+
+    @staticmethod
+    def _template_tokens(template, **variables) -> int:
+        """Tokens de la parte fija de un prompt de routing"""
+        return count_tokens("\n".join(message.content for message in template.format_messages(**variables)))
+
+    def _record_prompt_tokens(self, prompt: str, variable_text: str) -> int:
+        """Registra los tokens de un prompt de routing para monitoreo"""
+        tokens = self._prompt_base_tokens[prompt] + self.card_renderer.tokens + count_tokens(variable_text)
+        self.prompt_tokens["prompts"] += 1
+        self.prompt_tokens["total"] += tokens
+        self.prompt_tokens["last"] = tokens
+        return tokens
+
+    async def _execute_task(self, agent_name: str, task):
+        """Ejecuta la tarea en la réplica menos ocupada del agente, local o por HTTP"""
+        with metrics.track("task", "Tareas enviadas a los agentes", agent=agent_name), \
+                self.registry.acquire(agent_name) as replica:
+            if self.dispatch == "http" or not replica.is_local:
+                if self.http_client is None:
+                    self.http_client = A2AHttpClient()
+                return await self.http_client.send_task(replica.url, task)
+            return await replica.agent.handle_task_async(task)
+
+    async def close(self):
+        """Libera las conexiones HTTP hacia los agentes remotos y detiene los procesos worker"""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+        await asyncio.gather(*self._retiring, return_exceptions=True)
+        await asyncio.gather(*(process.aclose() for process in self.processes))
+        self.processes.clear()
+        if self._inventory_dir is not None:
+            shutil.rmtree(self._inventory_dir, ignore_errors=True)
+            self._inventory_dir = None
+
+    def _worker_env(self) -> Dict[str, str]:
+        """Variables de entorno de los procesos worker: inventario compartido y tamaño del pool MCP"""
+        inventory_db = os.getenv("MCP_INVENTORY_DB")
+        if not inventory_db:
+            if self._inventory_dir is None:
+                self._inventory_dir = tempfile.mkdtemp(prefix="mcp-inventory-")
+            inventory_db = os.path.join(self._inventory_dir, "inventory.db")
+        return {"MCP_INVENTORY_DB": inventory_db, "MCP_POOL_SIZE": str(self.worker_mcp_pool_size)}
+
+    def _new_order_queue(self, policy: str = None) -> OrderQueue:
+        return OrderQueue(policy or self.dispatch_policy, max_wait=self.max_queue_wait)
+
+    def _validate_orders(self, orders: List[Dict]) -> tuple[Dict[int, Dict], Dict[int, Dict]]:
+        """Separa los pedidos válidos (numerados desde 1) de los registros fallidos de los inválidos"""
+        pending, failed = {}, {}
+        for i, order in enumerate(orders, 1):
+            try:
+                self._check_order(order)
+            except ValueError as e:
+                logging.error(f"PEDIDO #{i}: pedido inválido: {e}")
+                failed[i] = self._build_failed_record(i, order if isinstance(order, dict) else {}, e)
+            else:
+                pending[i] = order
+        return pending, failed
+
+    @staticmethod
+    def _check_order(order):
+        """Valida que el pedido sea un diccionario con descripción y urgencia válida"""
+        if not isinstance(order, dict) or not order.get("description"):
+            raise ValueError("pedido sin descripción")
+        parse_urgency(order)
+
+    def _new_admission(self, queue: OrderQueue, per_agent: int) -> AdmissionControl:
+        return AdmissionControl(
+            queue,
+            self._estimate_duration,
+            slots=lambda agent: per_agent * max(1, self.registry.count(agent)),
+            max_queue_per_agent=self.max_queue_per_agent,
+            policy=self.overload_policy,
+            default_agent=self.default_agent,
+            counts=self.admission_counts,
+        )
+
+    def _admit(self, admission: AdmissionControl, order_id: int, order: Dict,
+               agent_name: str) -> tuple[Admission, List[Dict]]:
+        """Admite un pedido ya enrutado; devuelve la admisión y los registros de los pedidos que quedan fuera"""
+        result = admission.admit(order_id, order, agent_name)
+        rejected = []
+        if result.shed is not None:
+            shed = result.shed
+            logging.warning(f"PEDIDO #{shed.order_id} descartado de la cola de {shed.agent} "
+                            f"para atender el pedido #{order_id}, más urgente")
+            rejected.append(self._build_rejected_record(shed.order_id, shed.order, shed.agent,
+                                                        shed.estimated_wait, "descartado por sobrecarga"))
+        if not result.accepted:
+            logging.warning(f"PEDIDO #{order_id} rechazado: cola de {agent_name} llena "
+                            f"(espera estimada {result.estimated_wait:.1f}s)")
+            rejected.append(self._build_rejected_record(order_id, order, agent_name,
+                                                        result.estimated_wait, "cola del agente llena"))
+        elif result.status == "degraded":
+            logging.warning(f"PEDIDO #{order_id}: {agent_name} saturado, se envía a {result.agent} "
+                            f"(espera estimada {result.estimated_wait:.1f}s)")
+        else:
+            logging.info(f"PEDIDO #{order_id} en cola de {result.agent}, espera estimada {result.estimated_wait:.1f}s")
+        return result, rejected
+
+    def _estimate_duration(self, agent_name: str, description: str) -> float:
+        """Tiempo de preparación esperado según la receta que usaría el agente"""
+        return self.agents[agent_name].chef.select_recipe(description).preparation_time
+
+    def _build_task(self, description: str, order_id: int | None = None) -> "SimpleTask":
+        """Crea la tarea A2A mínima que reciben los agentes"""
+        task = SimpleTask()
+        task.message = {"content": {"type": "text", "text": description}, "role": "user"}
+        if order_id is not None:
+            task.message["metadata"] = {"order_id": str(order_id)}
+        return task
+
+    def _build_order_record(self, order_id: int, order: Dict, agent_name: str, result_task, queued=None) -> Dict:
+        """Construye el registro de un pedido completado"""
+        agent_card = self.agents[agent_name].agent_card
+        timing = {}
+        if queued is not None:
+            ticket_time = time.monotonic() - queued.enqueued_at
+            metrics.histogram("ticket_seconds", "Tiempo desde que el pedido entra a la cola hasta que está listo",
+                              agent=agent_name).record(ticket_time)
+            timing = {
+                "admission": queued.admission,
+                "priority": queued.priority,
+                "estimated_wait": queued.estimated_wait,
+                "ticket_time": ticket_time,
+                "deadline_met": queued.enqueued_at + ticket_time <= queued.deadline,
+            }
+        failed = getattr(result_task.status, "state", None) == TaskState.FAILED
+        if failed:
+            # El despacho HTTP y los procesos worker dejan la causa en status.message
+            message = getattr(result_task.status, "message", None) or {}
+            error = message.get("content", {}).get("text") or "la tarea del agente falló"
+        return {
+            "order_id": order_id,
+            "id": order.get("id"),
+            "description": order['description'],
+            "agent": agent_name,
+            "agent_card": agent_card.name,
+            "skills_used": [skill.name for skill in agent_card.skills],
+            "status": "failed" if failed else "completed",
+            "result": result_task.artifacts[0]["parts"][0]["text"] if result_task.artifacts else "N/A",
+            **({"error": error} if failed else {}),
+            **timing
+        }
+
+    def _build_rejected_record(self, order_id: int, order: Dict, agent_name: str, estimated_wait: float,
+                               reason: str) -> Dict:
+        """Registro de un pedido que el control de admisión dejó fuera"""
+        agent_card = self.agents[agent_name].agent_card
+        return {
+            "order_id": order_id,
+            "id": order.get("id"),
+            "description": order['description'],
+            "agent": agent_name,
+            "agent_card": agent_card.name,
+            "skills_used": [skill.name for skill in agent_card.skills],
+            "status": "rejected",
+            "result": f"Pedido no admitido: {reason} (espera estimada {estimated_wait:.1f}s)",
+            "error": reason,
+            "estimated_wait": estimated_wait,
+        }
+
+    @staticmethod
+    def _build_admission_record(order_id: int, order: Dict, admission: Admission) -> Dict:
+        """Aviso de que el pedido entró a la cola, con el agente asignado y la espera estimada"""
+        return {
+            "order_id": order_id,
+            "id": order.get("id"),
+            "description": order['description'],
+            "agent": admission.agent,
+            "status": admission.status,
+            "estimated_wait": admission.estimated_wait,
+        }
+
+    @staticmethod
+    def _build_failed_record(order_id: int, order: Dict, error: Exception, agent_name: str = None) -> Dict:
+        """Registro de un pedido que no se pudo completar"""
+        return {
+            "order_id": order_id,
+            "id": order.get("id"),
+            "description": order.get('description'),
+            "agent": agent_name,
+            "status": "failed",
+            "error": str(error),
+        }
+
+    def _log_agent_card(self, agent_card):
+        """Muestra el AgentCard y las skills del agente seleccionado"""
+        logging.info(f"Agent Card: {agent_card.name}")
+        logging.info(f"   └─ Skills disponibles: {len(agent_card.skills)}")
+        for skill in agent_card.skills:
+            logging.info(f"      • {skill.name} ({', '.join(skill.tags)})")
     
     
     def _print_summary(self):
@@ -134,14 +879,62 @@ class RestaurantOrchestrator():
         for order in self.completed_orders:
             logging.info(f"PEDIDO #{order['order_id']}")
             logging.info(f"   Descripción: {order['description']}")
-            logging.info(f"   Agente: {order['agent_card']}")
-            logging.info(f"   Skills usadas: {', '.join(order['skills_used'])}")
+            logging.info(f"   Agente: {order.get('agent_card') or order.get('agent') or '-'}")
+            logging.info(f"   Skills usadas: {', '.join(order.get('skills_used', []))}")
             logging.info(f"   Estado: {order['status'].upper()}")
             logging.info("")
-            for line in order['result'].split('\n'):
+            for line in (order.get('result') or order.get('error', '')).split('\n'):
                 if line.strip():
                     logging.info(f"   {line}")
             logging.info("")
+
+        ticket_times = sorted(order["ticket_time"] for order in self.completed_orders if "ticket_time" in order)
+        if ticket_times:
+            late = sum(not order.get("deadline_met", True) for order in self.completed_orders)
+            p95 = ticket_times[max(0, -(-len(ticket_times) * 95 // 100) - 1)]
+            logging.info(f"Tiempo de ticket: p95 {p95:.1f}s, máximo {ticket_times[-1]:.1f}s; "
+                         f"{late} pedidos fuera de plazo")
+
+        if any(self.admission_counts.get(status) for status in ("rejected", "shed", "degraded")):
+            logging.info(f"Admisión: {self.admission_counts.get('accepted', 0)} aceptados, "
+                         f"{self.admission_counts.get('degraded', 0)} degradados, "
+                         f"{self.admission_counts.get('rejected', 0)} rechazados, "
+                         f"{self.admission_counts.get('shed', 0)} descartados")
+
+        for name, labels, histogram in metrics.series(Histogram):
+            if histogram.count:
+                label_text = ", ".join(f"{value}" for value in labels.values())
+                logging.info(f"Latencia {name}{f' ({label_text})' if label_text else ''}: "
+                             f"p50 {histogram.percentile(0.5):.3f}s, p95 {histogram.percentile(0.95):.3f}s, "
+                             f"p99 {histogram.percentile(0.99):.3f}s, {histogram.count} mediciones")
+
+        cache_stats = self.routing_cache.stats()
+        logging.info(f"Cache de routing: {cache_stats['hits']} aciertos, "
+                     f"{cache_stats['misses']} fallos ({cache_stats['hit_rate']:.0%})")
+        if self.prompt_tokens["prompts"]:
+            logging.info(f"Prompts de routing: {self.prompt_tokens['prompts']}, "
+                         f"{self.prompt_tokens['total'] / self.prompt_tokens['prompts']:.0f} tokens en promedio")
+        for name, replicas in self.registry.stats().items():
+            if len(replicas) > 1:
+                load = ", ".join(f"#{replica['id']}: {replica['completed']}" for replica in replicas)
+                logging.info(f"Réplicas de {name} (tareas completadas): {load}")
+        for name, stats in self.station_stats().items():
+            for station, station_stats in stats.items():
+                logging.info(f"Estación {station} ({name}): {station_stats['utilization']:.0%} de utilización, "
+                             f"cola máxima {station_stats['max_queued']}, "
+                             f"espera promedio {station_stats['avg_wait']:.2f}s")
+        logging.info("")
+
+    def station_stats(self) -> Dict[str, Dict[str, dict]]:
+        """Métricas de las estaciones de cocina de cada réplica local"""
+        stats = {}
+        for name in self.agents:
+            replicas = [replica for replica in self.registry.replicas(name) if isinstance(replica.agent, ChefAgent)]
+            for replica in replicas:
+                if replica.agent.kitchen.stations:
+                    key = name if len(replicas) == 1 else f"{name} #{replica.id}"
+                    stats[key] = replica.agent.kitchen.stats()
+        return stats
     
     def show_agent_discovery(self):
         """Muestra el proceso de descubrimiento de agentes"""
@@ -0,0 +1,181 @@
+import heapq
+import itertools
+import math
+import time
+from collections import deque
+from typing import Callable, Dict
+
+# Clase de prioridad por tipo de pedido; menor número se despacha antes
+PRIORITY_CLASSES = {"delivery": 0, "dine-in": 1}
+DEFAULT_PRIORITY = "dine-in"
+
+
+def parse_urgency(order: Dict) -> tuple:
+    """(clase de prioridad, plazo en segundos o None) de un pedido
+
+    Lanza ValueError si "priority" no es una clase conocida o un entero, o si
+    "deadline" no es un número positivo de segundos.
+    """
+    priority = order.get("priority", DEFAULT_PRIORITY)
+    if isinstance(priority, str) and priority in PRIORITY_CLASSES:
+        priority = PRIORITY_CLASSES[priority]
+    elif isinstance(priority, bool) or not isinstance(priority, int):
+        raise ValueError(f"Prioridad de pedido desconocida: {priority!r}")
+
+    deadline = order.get("deadline")
+    if deadline is not None:
+        try:
+            if isinstance(deadline, bool):
+                raise TypeError
+            deadline = float(deadline)
+        except (TypeError, ValueError):
+            raise ValueError(f"Plazo de pedido inválido: {order['deadline']!r}") from None
+        if not math.isfinite(deadline) or deadline <= 0:
+            raise ValueError(f"El plazo del pedido debe ser un número positivo de segundos: {order['deadline']!r}")
+    return priority, deadline
+
+
+class QueuedOrder:
+    """Pedido en espera con su agente asignado y su tiempo estimado de preparación"""
+
+    def __init__(self, order_id: int, order: Dict, agent: str, duration: float,
+                 priority: int, deadline: float, enqueued_at: float, seq: int):
+        self.order_id = order_id
+        self.order = order
+        self.agent = agent
+        self.duration = duration
+        self.priority = priority
+        self.deadline = deadline
+        self.enqueued_at = enqueued_at
+        self.seq = seq
+        self.taken = False
+        # Resultado de la admisión ("accepted" o "degraded") y espera estimada en
+        # ese momento (ver Agents/AdmissionControl.py)
+        self.admission = "accepted"
+        self.estimated_wait = 0.0
+
+
+class OrderQueue:
+    """Cola de pedidos con prioridades, plazos y protección contra inanición
+
+    Políticas de despacho:
+        fifo: orden de llegada
+        edf: plazo más próximo primero (earliest deadline first)
+        sjf: preparación más corta primero (shortest job first)
+
+    En edf y sjf la clase de prioridad (delivery antes que dine-in) pesa más
+    que el plazo o la duración. Un pedido que lleva más de max_wait segundos
+    esperando se despacha antes que cualquier otro, para que los pedidos
+    largos o de baja prioridad no esperen indefinidamente.
+    """
+
+    POLICIES = ("fifo", "edf", "sjf")
+
+    def __init__(self, policy: str = "edf", max_wait: float = 30.0, default_deadline: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Política de despacho desconocida: {policy}")
+        self.policy = policy
+        self.max_wait = max_wait
+        self.default_deadline = default_deadline
+        self.clock = clock
+        self.promoted = 0
+        self._heap: list = []
+        self._arrivals: deque[QueuedOrder] = deque()
+        self._seq = itertools.count()
+        self._size = 0
+        # Pedidos y segundos de preparación en espera por agente
+        self._depth: Dict[str, int] = {}
+        self._work: Dict[str, float] = {}
+
+    def push(self, order_id: int, order: Dict, agent: str, duration: float) -> QueuedOrder:
+        """Encola un pedido; "priority" y "deadline" (segundos desde ahora) se leen del pedido"""
+        priority, deadline = self.urgency(order)
+        entry = QueuedOrder(
+            order_id=order_id,
+            order=order,
+            agent=agent,
+            duration=duration,
+            priority=priority,
+            deadline=deadline,
+            enqueued_at=self.clock(),
+            seq=next(self._seq),
+        )
+        heapq.heappush(self._heap, (self._key(entry), entry.seq, entry))
+        self._arrivals.append(entry)
+        self._size += 1
+        self._depth[agent] = self._depth.get(agent, 0) + 1
+        self._work[agent] = self._work.get(agent, 0.0) + duration
+        return entry
+
+    def urgency(self, order: Dict) -> tuple:
+        """(clase de prioridad, plazo absoluto) que tendría el pedido si se encolara ahora"""
+        priority, deadline = parse_urgency(order)
+        return priority, self.clock() + (self.default_deadline if deadline is None else deadline)
+
+    def pop(self, eligible: Callable[[QueuedOrder], bool] | None = None) -> QueuedOrder | None:
+        """Saca el siguiente pedido a despachar entre los elegibles, o None si no hay"""
+        eligible = eligible or (lambda entry: True)
+
+        # Protección contra inanición: el pedido elegible más antiguo que ya esperó demasiado
+        now = self.clock()
+        while self._arrivals and self._arrivals[0].taken:
+            self._arrivals.popleft()
+        for entry in self._arrivals:
+            if now - entry.enqueued_at < self.max_wait:
+                break
+            if not entry.taken and eligible(entry):
+                self.promoted += 1
+                return self._take(entry)
+
+        skipped = []
+        chosen = None
+        while self._heap:
+            item = heapq.heappop(self._heap)
+            entry = item[2]
+            if entry.taken:
+                continue
+            if eligible(entry):
+                chosen = entry
+                break
+            skipped.append(item)
+        for item in skipped:
+            heapq.heappush(self._heap, item)
+        return self._take(chosen) if chosen is not None else None
+
+    def remove(self, entry: QueuedOrder) -> bool:
+        """Saca de la cola un pedido en espera sin despacharlo"""
+        if entry.taken:
+            return False
+        self._take(entry)
+        return True
+
+    def lowest(self, agent: str) -> QueuedOrder | None:
+        """El pedido en espera del agente con menor prioridad y plazo más lejano"""
+        waiting = [entry for entry in self._arrivals if entry.agent == agent and not entry.taken]
+        return max(waiting, key=lambda entry: (entry.priority, entry.deadline, entry.seq), default=None)
+
+    def depth(self, agent: str) -> int:
+        """Pedidos en espera para el agente"""
+        return self._depth.get(agent, 0)
+
+    def queued_work(self, agent: str) -> float:
+        """Segundos de preparación estimados de los pedidos en espera del agente"""
+        return max(0.0, self._work.get(agent, 0.0))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _take(self, entry: QueuedOrder) -> QueuedOrder:
+        entry.taken = True
+        self._size -= 1
+        self._depth[entry.agent] -= 1
+        self._work[entry.agent] -= entry.duration
+        return entry
+
+    def _key(self, entry: QueuedOrder) -> tuple:
+        if self.policy == "edf":
+            return (entry.priority, entry.deadline)
+        if self.policy == "sjf":
+            return (entry.priority, entry.duration)
+        return ()
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import logging
+import sys
+from typing import AsyncIterator, Dict, Iterable
+from Agents.OrderQueue import parse_urgency
+from Metrics.Metrics import metrics
+
+
+def parse_order(text: str) -> Dict:
+    """Convierte una línea en pedido: un objeto JSON o solo la descripción en texto"""
+    text = text.strip()
+    return check_order(json.loads(text) if text.startswith("{") else text)
+
+
+def check_order(order) -> Dict:
+    """Valida un pedido ya decodificado; un texto se toma como la descripción"""
+    if isinstance(order, str):
+        order = {"description": order}
+    if not isinstance(order, dict) or not order.get("description"):
+        raise ValueError(f"Pedido sin descripción: {order}")
+    parse_urgency(order)
+    return order
+
+
+async def iterate_orders(orders: Iterable[Dict]) -> AsyncIterator[Dict]:
+    """Fuente a partir de una lista de pedidos ya conocidos"""
+    for order in orders:
+        yield order
+
+
+async def jsonl_orders(path: str, follow: bool = False, poll_interval: float = 0.5) -> AsyncIterator[Dict]:
+    """Lee pedidos de un archivo JSON-lines
+
+    Con follow=True sigue leyendo las líneas que se agreguen al archivo
+    (como tail -f) en lugar de terminar al llegar al final.
+    """
+    with open(path, encoding="utf-8") as f:
+        while True:
+            line = await asyncio.to_thread(f.readline)
+            if not line:
+                if not follow:
+                    return
+                await asyncio.sleep(poll_interval)
+                continue
+            if not line.strip():
+                continue
+            try:
+                yield parse_order(line)
+            except ValueError as e:
+                logging.error(f"[Pedidos] Línea inválida en {path}: {e}")
+
+
+async def stdin_orders() -> AsyncIterator[Dict]:
+    """Lee pedidos de la entrada estándar, uno por línea, hasta EOF"""
+    while True:
+        line = await asyncio.to_thread(sys.stdin.readline)
+        if not line:
+            return
+        if not line.strip():
+            continue
+        try:
+            yield parse_order(line)
+        except ValueError as e:
+            logging.error(f"[Pedidos] Línea inválida en stdin: {e}")
+
+
+async def http_orders(host: str = "127.0.0.1", port: int = 8080, max_pending: int = 1000) -> AsyncIterator[Dict]:
+    """Recibe pedidos por HTTP: POST /orders con un pedido o una lista de pedidos en JSON
+
+    Responde 202 en cuanto el pedido queda en la cola de entrada, o 503 si
+    la cola está llena. GET /metrics devuelve las métricas del proceso en
+    formato Prometheus (GET /metrics?format=json para JSON). Corre
+    indefinidamente.
+    """
+    pending: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        status, body = 400, {"error": "petición inválida"}
+        content_type = "application/json"
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            payload = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            method, target = request_line[:2]
+            if method == "GET" and target.partition("?")[0] == "/metrics":
+                status = 200
+                if target.endswith("format=json"):
+                    body = metrics.to_dict()
+                else:
+                    body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+            elif [method, target] != ["POST", "/orders"]:
+                status, body = 404, {"error": "use POST /orders o GET /metrics"}
+            else:
+                data = json.loads(payload)
+                orders = [check_order(order) for order in (data if isinstance(data, list) else [data])]
+                if pending.maxsize - pending.qsize() < len(orders):
+                    status, body = 503, {"error": "cola de pedidos llena"}
+                else:
+                    for order in orders:
+                        pending.put_nowait(order)
+                    status, body = 202, {"accepted": len(orders)}
+        except (ValueError, IndexError, asyncio.IncompleteReadError) as e:
+            status, body, content_type = 400, {"error": str(e)}, "application/json"
+
+        reason = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}[status]
+        content = (body if isinstance(body, str) else json.dumps(body, ensure_ascii=False)).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(content)}\r\nConnection: close\r\n\r\n".encode("latin-1") + content)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logging.info(f"[Pedidos] Recibiendo pedidos en http://{host}:{port}/orders")
+    try:
+        while True:
+            yield await pending.get()
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def order_source_from_spec(spec: str) -> AsyncIterator[Dict]:
+    """Crea una fuente de pedidos a partir de su especificación en texto
+
+    Ejemplos: "stdin", "jsonl:pedidos.jsonl", "jsonl+follow:pedidos.jsonl",
+    "http:8080", "http:0.0.0.0:8080".
+    """
+    kind, _, target = spec.partition(":")
+    if kind == "stdin":
+        return stdin_orders()
+    if kind in ("jsonl", "jsonl+follow"):
+        if not target:
+            raise ValueError(f"Falta la ruta del archivo de pedidos: {spec}")
+        return jsonl_orders(target, follow=kind == "jsonl+follow")
+    if kind == "http":
+        host, _, port = target.rpartition(":")
+        try:
+            return http_orders(host or "127.0.0.1", int(port))
+        except ValueError:
+            raise ValueError(f"Puerto HTTP inválido: {spec}")
+    raise ValueError(f"Fuente de pedidos desconocida: {spec}")
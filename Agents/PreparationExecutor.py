@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, List
+from Recipes.RecipeBook import RecipeStep
+from Recipes.Stations import Kitchen
+from Recipes.StepScheduler import StepScheduler, critical_path
+
+
+class PreparationExecutor:
+    """Ejecuta los pasos de una preparación solapando las llamadas MCP
+
+    Los pasos corren según su grafo de dependencias. Las llamadas de
+    bitácora no se esperan, la validación de ingredientes corre en paralelo
+    con los pasos y solo la esperan los pasos que usan los ingredientes, y
+    al terminar el log de completado y el score de calidad se piden a la vez.
+    """
+
+    def __init__(self, mcp_client, agent_name: str, item_name: str, item_type: str,
+                 kitchen: Kitchen | None = None):
+        self.mcp_client = mcp_client
+        self.agent_name = agent_name
+        self.item_name = item_name
+        self.item_type = item_type
+        # Estaciones compartidas con las demás preparaciones del agente
+        self.kitchen = kitchen or Kitchen()
+
+    async def run(self, steps: List[RecipeStep], ingredients: List[str], order_id: str = "") -> dict:
+        """Ejecuta los pasos y devuelve bitácora, tiempo de ruta crítica, validación y score
+
+        Args:
+            steps: Pasos de la receta en un orden válido de dependencias
+            ingredients: Ingredientes a validar en inventario
+            order_id: Identificador del pedido para la bitácora
+        """
+        started_at = time.time()
+        self.mcp_client.notify_tool("log_preparation_start", {
+            "item_name": self.item_name,
+            "agent_name": self.agent_name,
+            "order_id": order_id,
+            "started_at": started_at
+        })
+        validation = asyncio.create_task(
+            self.mcp_client.call_tool("validate_ingredients", {"ingredients": ingredients})
+        )
+
+        preparation_log = []
+        station_wait = 0.0
+        checking = asyncio.Lock()
+        checked = False
+        validation_result = None
+
+        async def check_validation():
+            # Solo el primer paso que llega revisa (y reporta) la validación
+            nonlocal checked, validation_result
+            async with checking:
+                if not checked:
+                    validation_result = await self._check_validation(validation)
+                    checked = True
+
+        async def execute(step: RecipeStep):
+            nonlocal station_wait
+            if step.uses_ingredients:
+                await check_validation()
+            requested = time.monotonic()
+            async with self.kitchen.use(step.station):
+                station_wait += time.monotonic() - requested
+                logging.info(f"  └─ {step.description}")
+                await asyncio.sleep(step.duration)
+            preparation_log.append({
+                "step": step.description,
+                "timestamp": datetime.now().isoformat()
+            })
+
+        try:
+            await StepScheduler(steps).run(execute)
+            # Ningún paso necesita los ingredientes: se espera al final
+            await check_validation()
+        finally:
+            if not validation.done():
+                validation.cancel()
+
+        total_time, _ = critical_path(steps)
+
+        self.mcp_client.notify_tool("log_preparation_complete", {
+            "item_name": self.item_name,
+            "agent_name": self.agent_name,
+            "preparation_time": total_time,
+            "order_id": order_id,
+            "started_at": started_at,
+            "finished_at": time.time()
+        })
+        quality_result = await self.mcp_client.call_tool("get_quality_score", {
+            "item_type": self.item_type,
+            "preparation_time": total_time
+        })
+
+        return {
+            "steps": preparation_log,
+            "preparation_time": total_time,
+            "station_wait": station_wait,
+            "validation": validation_result,
+            "quality": quality_result,
+        }
+
+    async def _check_validation(self, validation: asyncio.Task) -> Any:
+        """Espera la validación de ingredientes y avisa si falta alguno"""
+        result = await validation
+        if result is None or "faltantes" in result:
+            logging.warning(f"[{self.agent_name}] Validación de ingredientes: {result}")
+        return result
@@ -0,0 +1,99 @@
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any
+
+
+class EventSink:
+    """Registro de eventos estructurados en archivos JSON-lines con rotación
+
+    emit() solo encola el evento en una cola acotada y regresa de inmediato;
+    un hilo en segundo plano los escribe al archivo. Si la cola está llena el
+    evento se descarta y se cuenta, de modo que el registro nunca frena a
+    quien lo emite.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, max_queue: int = 10000, max_bytes: int = 10 * 1024 * 1024, backups: int = 5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.emitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._writer = threading.Thread(target=self._drain, name="mcp-event-writer", daemon=True)
+        self._writer.start()
+
+    def emit(self, event: str, **fields: Any) -> bool:
+        """Encola un evento; devuelve False si se descartó por falta de espacio"""
+        record = {"event": event, "ts": time.time(), **fields}
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.emitted += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def stats(self) -> dict:
+        """Métricas de la cola para detectar contrapresión"""
+        return {
+            "queued": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "max_depth": self.max_depth,
+            "emitted": self.emitted,
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+    def close(self, timeout: float = 5.0):
+        """Escribe los eventos pendientes y cierra el archivo, esperando a lo más timeout segundos"""
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            # El escritor murió o está atascado: los eventos pendientes se pierden
+            pass
+        self._writer.join(timeout)
+        if not self._writer.is_alive():
+            self._file.close()
+
+    def _drain(self):
+        while True:
+            record = self._queue.get()
+            if record is self._STOP:
+                break
+            self._write(json.dumps(record, ensure_ascii=False) + "\n")
+            # Agrupa las escrituras: solo hace flush cuando la cola se vacía
+            if self._queue.empty():
+                self._file.flush()
+        self._file.flush()
+
+    def _write(self, line: str):
+        if self.max_bytes and self._file.tell() + len(line) > self.max_bytes:
+            self._rotate()
+        self._file.write(line)
+        self.written += 1
+
+    def _rotate(self):
+        """Rota los archivos: events.jsonl → events.jsonl.1 → ... → events.jsonl.N"""
+        self._file.close()
+        for i in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
@@ -0,0 +1,147 @@
+import json
+import threading
+from collections import Counter
+from typing import Dict, Iterable
+from Routing.TextNormalization import normalize_text
+
+# Calificativos que no cambian el ingrediente ("champiñones frescos" → "champiñones")
+MODIFIERS = {
+    "fresco", "fresca", "frescos", "frescas", "premium", "extra", "organico",
+    "organica", "organicos", "organicas", "crujiente", "crujientes", "especial",
+    "artesanal", "gourmet", "caramelizada", "caramelizado", "picado", "picada",
+    "rebanado", "rebanada", "natural", "selecto", "selecta",
+}
+
+
+def alias_keys(sku: str, synonyms: Iterable[str] = ()) -> list[str]:
+    """Llaves de búsqueda de un SKU: nombre y sinónimos normalizados, con sus singulares"""
+    keys = []
+    for alias in [sku, *synonyms]:
+        key = normalize_text(alias)
+        keys += [key, *_singular_variants(key)]
+    return keys
+
+
+def _singular_variants(key: str) -> list[str]:
+    """Variantes en singular de una llave normalizada (tomates → tomate, champinones → champinon)"""
+    variants = []
+    words = key.split()
+    last = words[-1] if words else ""
+    if len(last) > 3 and last.endswith("es"):
+        variants.append(" ".join(words[:-1] + [last[:-2]]))
+    if len(last) > 3 and last.endswith("s"):
+        variants.append(" ".join(words[:-1] + [last[:-1]]))
+    return variants
+
+
+class Inventory:
+    """Catálogo de ingredientes con existencias, indexado por nombre normalizado
+
+    Cada ingrediente (SKU) se indexa por su nombre, sus sinónimos y sus
+    formas en singular, sin acentos ni mayúsculas, de modo que resolver un
+    nombre es una búsqueda en diccionario. Las reservas por pedido son
+    atómicas: se apartan todos los ingredientes o ninguno.
+    """
+
+    def __init__(self, catalog: Dict[str, dict] | None = None):
+        self.stock: Dict[str, int] = {}
+        self.reservations: Dict[str, Counter] = {}
+        self._index: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        for sku, entry in (catalog or {}).items():
+            self.add_item(sku, entry.get("stock", 0), entry.get("synonyms", []))
+
+    @classmethod
+    def from_file(cls, path: str) -> "Inventory":
+        """Carga el catálogo desde un archivo JSON {sku: {"stock": n, "synonyms": [...]}}"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def add_item(self, sku: str, stock: int, synonyms: Iterable[str] = ()):
+        """Agrega o actualiza un ingrediente del catálogo"""
+        with self._lock:
+            self.stock[sku] = stock
+            for key in alias_keys(sku, synonyms):
+                self._index.setdefault(key, sku)
+
+    def resolve(self, name: str) -> str | None:
+        """Devuelve el SKU de un nombre de ingrediente, o None si no está en el catálogo"""
+        key = normalize_text(name)
+        base = " ".join(word for word in key.split() if word not in MODIFIERS)
+        for candidate in (key, base):
+            for variant in [candidate, *_singular_variants(candidate)]:
+                sku = self._index.get(variant)
+                if sku is not None:
+                    return sku
+        return None
+
+    def validate(self, ingredients: Iterable[str]) -> dict:
+        """Revisa si hay existencias suficientes para una lista de ingredientes"""
+        resolved = self._resolve_all(ingredients)
+        with self._lock:
+            return self._check_locked(resolved)
+
+    def validate_bulk(self, orders: Dict[str, list[str]]) -> dict:
+        """Valida muchos pedidos a la vez
+
+        Además del resultado por pedido indica si las existencias alcanzan
+        para todos los pedidos juntos.
+        """
+        resolved = {order_id: self._resolve_all(ingredients) for order_id, ingredients in orders.items()}
+        combined = [item for items in resolved.values() for item in items]
+
+        with self._lock:
+            results = {order_id: self._check_locked(items) for order_id, items in resolved.items()}
+            total = self._check_locked(combined)
+
+        return {
+            "orders": results,
+            "all_available": total["available"],
+            "short": total["short"],
+        }
+
+    def reserve(self, order_id: str, ingredients: Iterable[str]) -> dict:
+        """Aparta los ingredientes de un pedido; si falta alguno no aparta ninguno"""
+        resolved = self._resolve_all(ingredients)
+        with self._lock:
+            result = self._check_locked(resolved)
+            if result["available"]:
+                demand = Counter(sku for _, sku in resolved)
+                for sku, quantity in demand.items():
+                    self.stock[sku] -= quantity
+                self.reservations.setdefault(order_id, Counter()).update(demand)
+            result["reserved"] = result["available"]
+            return result
+
+    def release(self, order_id: str) -> bool:
+        """Devuelve al inventario lo apartado para un pedido"""
+        with self._lock:
+            reserved = self.reservations.pop(order_id, None)
+            if reserved is None:
+                return False
+            for sku, quantity in reserved.items():
+                self.stock[sku] += quantity
+            return True
+
+    def _stock_levels(self, skus: Iterable[str]) -> Dict[str, int]:
+        """Existencias actuales de los SKUs indicados"""
+        return {sku: self.stock.get(sku, 0) for sku in skus}
+
+    def _resolve_all(self, ingredients: Iterable[str]) -> list[tuple[str, str | None]]:
+        return [(name, self.resolve(name)) for name in ingredients]
+
+    def _check_locked(self, resolved: list[tuple[str, str | None]]) -> dict:
+        """Compara la demanda contra las existencias; requiere tener el lock"""
+        demand = Counter(sku for _, sku in resolved if sku is not None)
+        levels = self._stock_levels(demand)
+        short = {
+            sku: quantity - levels.get(sku, 0)
+            for sku, quantity in demand.items()
+            if levels.get(sku, 0) < quantity
+        }
+        missing = [name for name, sku in resolved if sku is None or sku in short]
+        return {
+            "available": not missing,
+            "missing": missing,
+            "short": short,
+        }
@@ -0,0 +1,176 @@
+import json
+import sqlite3
+from collections import Counter
+from typing import Dict, Iterable
+from MCP.Inventory import Inventory, alias_keys
+
+
+class SQLiteInventory(Inventory):
+    """Inventario persistente en SQLite, compartido entre procesos McpServer.py
+
+    La base usa modo WAL: las lecturas no bloquean ni esperan a las
+    escrituras, y cada reserva o liberación es una transacción inmediata
+    cuyos descuentos solo se aplican si hay existencias suficientes, de modo
+    que varios procesos pueden descontar del mismo inventario sin
+    inconsistencias.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS items (
+            sku TEXT PRIMARY KEY,
+            stock INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS aliases (
+            alias TEXT PRIMARY KEY,
+            sku TEXT NOT NULL REFERENCES items(sku)
+        );
+        CREATE TABLE IF NOT EXISTS reservations (
+            order_id TEXT NOT NULL,
+            sku TEXT NOT NULL REFERENCES items(sku),
+            quantity INTEGER NOT NULL,
+            PRIMARY KEY (order_id, sku)
+        );
+    """
+
+    def __init__(self, path: str, catalog: Dict[str, dict] | None = None):
+        super().__init__()
+        self.path = path
+        # isolation_level=None: las transacciones se controlan explícitamente
+        self._db = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+        self._data_version = None
+
+        if catalog:
+            self.seed(catalog)
+        self._reload_index()
+
+    @classmethod
+    def from_file(cls, path: str, db_path: str) -> "SQLiteInventory":
+        """Abre la base en db_path y la siembra con el catálogo JSON de path"""
+        with open(path, encoding="utf-8") as f:
+            return cls(db_path, json.load(f))
+
+    def seed(self, catalog: Dict[str, dict]):
+        """Agrega los SKUs del catálogo que no existan, sin tocar existencias ya guardadas"""
+        with self._lock, self._transaction():
+            for sku, entry in catalog.items():
+                self._db.execute("INSERT OR IGNORE INTO items (sku, stock) VALUES (?, ?)", (sku, entry.get("stock", 0)))
+                self._insert_aliases(sku, entry.get("synonyms", []))
+        self._reload_index()
+
+    def add_item(self, sku: str, stock: int, synonyms: Iterable[str] = ()):
+        """Agrega o actualiza un ingrediente y sus existencias"""
+        with self._lock, self._transaction():
+            self._db.execute(
+                "INSERT INTO items (sku, stock) VALUES (?, ?) ON CONFLICT(sku) DO UPDATE SET stock = excluded.stock",
+                (sku, stock),
+            )
+            self._insert_aliases(sku, synonyms)
+        self._reload_index()
+
+    def resolve(self, name: str) -> str | None:
+        """Resuelve el SKU; si no se encuentra, recarga los alias agregados por otros procesos"""
+        sku = super().resolve(name)
+        if sku is None and self._index_is_stale():
+            self._reload_index()
+            sku = super().resolve(name)
+        return sku
+
+    def reserve(self, order_id: str, ingredients: Iterable[str]) -> dict:
+        """Aparta los ingredientes de un pedido en una sola transacción (todos o ninguno)"""
+        resolved = self._resolve_all(ingredients)
+        demand = Counter(sku for _, sku in resolved if sku is not None)
+
+        with self._lock:
+            if all(sku is not None for _, sku in resolved):
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    for sku, quantity in demand.items():
+                        cursor = self._db.execute(
+                            "UPDATE items SET stock = stock - ? WHERE sku = ? AND stock >= ?",
+                            (quantity, sku, quantity),
+                        )
+                        if cursor.rowcount == 0:
+                            raise _InsufficientStock()
+                        self._db.execute(
+                            "INSERT INTO reservations (order_id, sku, quantity) VALUES (?, ?, ?) "
+                            "ON CONFLICT(order_id, sku) DO UPDATE SET quantity = quantity + excluded.quantity",
+                            (order_id, sku, quantity),
+                        )
+                except _InsufficientStock:
+                    self._db.execute("ROLLBACK")
+                except Exception:
+                    self._db.execute("ROLLBACK")
+                    raise
+                else:
+                    self._db.execute("COMMIT")
+                    return {"available": True, "missing": [], "short": {}, "reserved": True}
+
+            result = self._check_locked(resolved)
+            result["reserved"] = False
+            return result
+
+    def release(self, order_id: str) -> bool:
+        """Devuelve al inventario lo apartado para un pedido"""
+        with self._lock, self._transaction():
+            rows = self._db.execute(
+                "SELECT sku, quantity FROM reservations WHERE order_id = ?", (order_id,)
+            ).fetchall()
+            if not rows:
+                return False
+            self._db.executemany("UPDATE items SET stock = stock + ? WHERE sku = ?", [(q, sku) for sku, q in rows])
+            self._db.execute("DELETE FROM reservations WHERE order_id = ?", (order_id,))
+            return True
+
+    def stock_of(self, sku: str) -> int:
+        """Existencias actuales de un SKU"""
+        return self._stock_levels([sku]).get(sku, 0)
+
+    def close(self):
+        """Cierra la conexión a la base"""
+        self._db.close()
+
+    def _stock_levels(self, skus: Iterable[str]) -> Dict[str, int]:
+        skus = list(skus)
+        if not skus:
+            return {}
+        placeholders = ",".join("?" * len(skus))
+        return dict(self._db.execute(f"SELECT sku, stock FROM items WHERE sku IN ({placeholders})", skus))
+
+    def _insert_aliases(self, sku: str, synonyms: Iterable[str]):
+        self._db.executemany(
+            "INSERT OR IGNORE INTO aliases (alias, sku) VALUES (?, ?)",
+            [(key, sku) for key in alias_keys(sku, synonyms)],
+        )
+
+    def _index_is_stale(self) -> bool:
+        """Indica si otro proceso modificó la base desde la última carga de alias"""
+        return self._db.execute("PRAGMA data_version").fetchone()[0] != self._data_version
+
+    def _reload_index(self):
+        self._data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        self._index = dict(self._db.execute("SELECT alias, sku FROM aliases"))
+
+    def _transaction(self):
+        return _Transaction(self._db)
+
+
+class _InsufficientStock(Exception):
+    """Un SKU no tiene existencias suficientes dentro de una reserva"""
+
+
+class _Transaction:
+    """Transacción de escritura inmediata: COMMIT al salir, ROLLBACK si hay error"""
+
+    def __init__(self, db: sqlite3.Connection):
+        self._db = db
+
+    def __enter__(self):
+        self._db.execute("BEGIN IMMEDIATE")
+        return self._db
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._db.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
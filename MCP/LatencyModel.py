@@ -0,0 +1,97 @@
+import asyncio
+import random
+
+
+class LatencyModel:
+    """Latencia artificial que agregan las tools del servidor MCP
+
+    En producción no se agrega nada; para simulaciones y pruebas de carga
+    se puede usar una latencia fija o muestreada de una distribución.
+    """
+
+    def sample(self) -> float:
+        """Segundos de latencia para la siguiente llamada"""
+        return 0.0
+
+    async def delay(self):
+        """Espera la latencia de una llamada"""
+        seconds = self.sample()
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def __repr__(self) -> str:
+        return "none"
+
+
+class FixedLatency(LatencyModel):
+    """Latencia constante por llamada"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def sample(self) -> float:
+        return self.seconds
+
+    def __repr__(self) -> str:
+        return f"fixed:{self.seconds}"
+
+
+class SampledLatency(LatencyModel):
+    """Latencia muestreada de una distribución de probabilidad
+
+    Distribuciones soportadas y sus parámetros:
+        uniform: mínimo, máximo
+        normal: media, desviación estándar
+        lognormal: mu, sigma
+        exponential: media
+    """
+
+    # nombre → (número de parámetros, muestreador)
+    DISTRIBUTIONS = {
+        "uniform": (2, lambda rng, low, high: rng.uniform(low, high)),
+        "normal": (2, lambda rng, mean, stddev: rng.gauss(mean, stddev)),
+        "lognormal": (2, lambda rng, mu, sigma: rng.lognormvariate(mu, sigma)),
+        "exponential": (1, lambda rng, mean: rng.expovariate(1.0 / mean)),
+    }
+
+    def __init__(self, distribution: str, *params: float, seed: int | None = None):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Distribución de latencia desconocida: {distribution}")
+        param_count, sampler = self.DISTRIBUTIONS[distribution]
+        if len(params) != param_count:
+            raise ValueError(f"La distribución {distribution} necesita {param_count} parámetros")
+        self.distribution = distribution
+        self.params = params
+        self._sampler = sampler
+        self._rng = random.Random(seed)
+
+    def sample(self) -> float:
+        # Las distribuciones no acotadas pueden dar valores negativos
+        return max(0.0, self._sampler(self._rng, *self.params))
+
+    def __repr__(self) -> str:
+        return f"{self.distribution}:{','.join(str(p) for p in self.params)}"
+
+
+def latency_model_from_spec(spec: str | None) -> LatencyModel:
+    """Crea un modelo de latencia a partir de su especificación en texto
+
+    Ejemplos: "none", "fixed:0.1", "uniform:0.05,0.2", "normal:0.1,0.02",
+    "exponential:0.1". Se puede agregar una semilla con "@", p. ej.
+    "normal:0.1,0.02@42".
+    """
+    if not spec or spec == "none":
+        return LatencyModel()
+
+    spec, _, seed = spec.partition("@")
+    kind, _, raw_params = spec.partition(":")
+    try:
+        params = [float(p) for p in raw_params.split(",") if p]
+    except ValueError:
+        raise ValueError(f"Parámetros de latencia inválidos: {spec}")
+
+    if kind == "fixed":
+        if len(params) != 1:
+            raise ValueError(f"La latencia fija necesita un solo valor: {spec}")
+        return FixedLatency(params[0])
+    return SampledLatency(kind, *params, seed=int(seed) if seed else None)
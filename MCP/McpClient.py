@@ -1,18 +1,25 @@
 import asyncio
+import json
 import logging
+import os
+import shutil
+import tempfile
 from typing import Any
 from contextlib import AsyncExitStack
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from Metrics.Metrics import metrics
 
 class MCPClient:
     """Cliente para interactuar con el servidor MCP"""
     
-    def __init__(self, server_script_path: str = "MCP/McpServer.py"):
+    def __init__(self, server_script_path: str = "MCP/McpServer.py", server_args: list[str] | None = None):
         self.server_script_path = server_script_path
+        self.server_args = server_args or []
         self.session: ClientSession | None = None
         self.exit_stack = AsyncExitStack()
         self._connected = False
+        self._notifications: set[asyncio.Task] = set()
         
     async def connect(self):
         """Establece conexión con el servidor MCP"""
@@ -23,7 +30,7 @@ class MCPClient:
         try:
             server_params = StdioServerParameters(
                 command="python",
-                args=[self.server_script_path],
+                args=[self.server_script_path, *self.server_args],
                 env=None
             )
             
@@ -43,9 +50,6 @@ class MCPClient:
             self._connected = True
             logging.info("[MCP Client] ✓ Conectado al servidor MCP")
             
-            # Pequeño delay para asegurar que la conexión está estable
-            await asyncio.sleep(0.1)
-            
             return True
             
         except Exception as e:
@@ -71,6 +75,7 @@ class MCPClient:
             
         try:
             logging.info("[MCP Client] Cerrando conexión...")
+            await self._drain_notifications(self._notifications)
             await self._cleanup()
             logging.info("[MCP Client] ✓ Desconectado del servidor MCP")
         except Exception as e:
@@ -108,7 +113,8 @@ class MCPClient:
             logging.info(f"[MCP Client] → Llamando a tool: {tool_name}")
             logging.debug(f"[MCP Client]   Argumentos: {arguments}")
             
-            result = await self.session.call_tool(tool_name, arguments=arguments)
+            with metrics.track("mcp_call", "Llamadas a tools MCP", tool=tool_name):
+                result = await self.session.call_tool(tool_name, arguments=arguments)
             
             # Extraer contenido de la respuesta
             if hasattr(result, 'content') and result.content:
@@ -123,11 +129,318 @@ class MCPClient:
             logging.error(f"[MCP Client] ✗ Error al llamar tool {tool_name}: {e}")
             return None
     
+    async def call_tools_batch(self, calls: list[tuple[str, dict[str, Any]]], composite: bool = False) -> list[Any]:
+        """Llama a varias herramientas independientes y devuelve los resultados en orden
+        
+        Args:
+            calls: Lista de (nombre de la herramienta, argumentos)
+            composite: Si es True, envía todas las llamadas en una sola petición
+                a la tool run_batch del servidor; si no, las envía en paralelo
+                sobre la misma sesión
+        """
+        if composite:
+            return await self._call_composite(self, calls)
+        return list(await asyncio.gather(
+            *(self.call_tool(tool_name, arguments) for tool_name, arguments in calls)
+        ))
+    
+    def notify_tool(self, tool_name: str, arguments: dict[str, Any]) -> asyncio.Task:
+        """Llama a una herramienta sin esperar la respuesta (fire-and-forget)
+        
+        Pensado para bitácoras y notificaciones: la llamada corre en segundo
+        plano y disconnect() espera a que terminen las pendientes.
+        """
+        return self._spawn_notification(self._notifications, self.call_tool(tool_name, arguments))
+    
+    @staticmethod
+    def _spawn_notification(notifications: set[asyncio.Task], call) -> asyncio.Task:
+        task = asyncio.create_task(call)
+        notifications.add(task)
+        task.add_done_callback(notifications.discard)
+        return task
+    
+    @staticmethod
+    async def _drain_notifications(notifications: set[asyncio.Task], timeout: float = 5.0):
+        """Espera las notificaciones pendientes; cancela las que excedan el timeout"""
+        if not notifications:
+            return
+        _, pending = await asyncio.wait(set(notifications), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logging.error(f"[MCP Client] {len(pending)} notificaciones canceladas al cerrar")
+    
+    @staticmethod
+    async def _call_composite(client, calls: list[tuple[str, dict[str, Any]]]) -> list[Any]:
+        """Ejecuta las llamadas con la tool run_batch del servidor"""
+        operations = [{"tool": tool_name, "arguments": arguments} for tool_name, arguments in calls]
+        result = await client.call_tool("run_batch", {"operations": operations})
+        try:
+            results = json.loads(result) if result is not None else None
+        except json.JSONDecodeError:
+            results = None
+        
+        if not isinstance(results, list) or len(results) != len(calls):
+            logging.error("[MCP Client] ✗ Respuesta inválida de run_batch")
+            return [None] * len(calls)
+        return results
+    
+    async def ping(self, timeout: float = 5.0) -> bool:
+        """Verifica que el servidor MCP siga respondiendo
+        
+        Args:
+            timeout: Segundos máximos de espera por la respuesta
+        """
+        if not self._connected or not self.session:
+            return False
+        
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+            return True
+        except Exception as e:
+            logging.error(f"[MCP Client] ✗ El servidor no responde: {e}")
+            return False
+    
     def is_connected(self) -> bool:
         """Verifica si hay una conexión activa"""
         return self._connected and self.session is not None
 
 
+class _PooledSession:
+    """Sesión del pool: un MCPClient con su propio proceso servidor
+    
+    La conexión se abre y se cierra dentro de una misma tarea dueña, como
+    exigen los context managers de stdio_client.
+    """
+    
+    def __init__(self, index: int):
+        self.index = index
+        self.client: MCPClient | None = None
+        self.in_flight = 0
+        self.healthy = False
+        self._stop = asyncio.Event()
+        self._task: asyncio.Task | None = None
+    
+    async def start(self, server_script_path: str, server_args: list[str]) -> bool:
+        """Lanza la tarea dueña y espera a que la conexión quede lista"""
+        ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._own(server_script_path, server_args, ready))
+        self.healthy = await ready
+        return self.healthy
+    
+    async def stop(self):
+        """Cierra la sesión y espera a que la tarea dueña termine"""
+        self.healthy = False
+        self._stop.set()
+        if self._task is not None:
+            await self._task
+    
+    async def _own(self, server_script_path: str, server_args: list[str], ready: asyncio.Future):
+        client = MCPClient(server_script_path, server_args)
+        if not await client.connect():
+            ready.set_result(False)
+            return
+        self.client = client
+        ready.set_result(True)
+        try:
+            await self._stop.wait()
+        finally:
+            await client.disconnect()
+
+
+class MCPClientPool:
+    """Pool de sesiones MCP, cada una sobre su propio proceso McpServer.py
+    
+    Reparte las llamadas a la sesión con menos llamadas en curso, revisa
+    periódicamente que las sesiones respondan y reemplaza las caídas.
+    Expone la misma interfaz que MCPClient para que los agentes lo usen
+    indistintamente.
+    
+    Con más de una sesión, el inventario debe ser compartido: si no se
+    indicó --inventory-db, las sesiones usan una base SQLite temporal común
+    que se borra al desconectar. Así la reserva y la liberación de un pedido
+    ven las mismas existencias aunque lleguen a sesiones distintas.
+    """
+    
+    def __init__(self, server_script_path: str = "MCP/McpServer.py", size: int = 3,
+                 health_check_interval: float = 10.0, server_args: list[str] | None = None):
+        self.server_script_path = server_script_path
+        self.server_args = server_args or []
+        self.size = size
+        self.health_check_interval = health_check_interval
+        self.replacements = 0
+        self._sessions: list[_PooledSession] = []
+        self._health_task: asyncio.Task | None = None
+        self._replacing: set[int] = set()
+        self._notifications: set[asyncio.Task] = set()
+        self._closed = False
+        self._inventory_dir: str | None = None
+    
+    async def connect(self) -> bool:
+        """Inicia todas las sesiones en paralelo; basta con que una conecte"""
+        self._closed = False
+        if self.size > 1 and "--inventory-db" not in self.server_args:
+            self._inventory_dir = tempfile.mkdtemp(prefix="mcp-inventory-")
+            self.server_args = [*self.server_args, "--inventory-db", os.path.join(self._inventory_dir, "inventory.db")]
+        self._sessions = [_PooledSession(i) for i in range(self.size)]
+        results = await asyncio.gather(
+            *(session.start(self.server_script_path, self.server_args) for session in self._sessions)
+        )
+        connected = sum(results)
+        logging.info(f"[MCP Pool] ✓ {connected}/{self.size} sesiones conectadas")
+        
+        if connected == 0:
+            self._remove_shared_inventory()
+            return False
+        
+        if self.health_check_interval > 0:
+            self._health_task = asyncio.create_task(self._health_loop())
+        return True
+    
+    async def disconnect(self):
+        """Detiene el health check y cierra todas las sesiones"""
+        await MCPClient._drain_notifications(self._notifications)
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        
+        await asyncio.gather(*(session.stop() for session in self._sessions))
+        self._sessions = []
+        self._remove_shared_inventory()
+        logging.info("[MCP Pool] ✓ Sesiones cerradas")
+    
+    def _remove_shared_inventory(self):
+        """Borra la base temporal del inventario compartido, si el pool la creó"""
+        if self._inventory_dir is None:
+            return
+        index = self.server_args.index("--inventory-db")
+        self.server_args = self.server_args[:index] + self.server_args[index + 2:]
+        shutil.rmtree(self._inventory_dir, ignore_errors=True)
+        self._inventory_dir = None
+    
+    async def list_tools(self) -> list:
+        """Lista las herramientas usando cualquier sesión sana"""
+        session = self._pick()
+        if session is None:
+            logging.error("[MCP Pool] No hay sesiones activas")
+            return []
+        return await session.client.list_tools()
+    
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
+        """Llama a una herramienta en la sesión menos ocupada
+        
+        Si la llamada falla porque la sesión murió, la reemplaza y reintenta
+        una vez en otra sesión.
+        """
+        for attempt in range(2):
+            session = self._pick()
+            if session is None:
+                logging.error("[MCP Pool] No hay sesiones activas")
+                return None
+            
+            session.in_flight += 1
+            try:
+                result = await session.client.call_tool(tool_name, arguments)
+            finally:
+                session.in_flight -= 1
+            
+            if result is not None or await session.client.ping():
+                return result
+            
+            logging.error(f"[MCP Pool] Sesión {session.index} caída, reemplazando...")
+            self._schedule_replacement(session)
+        
+        return None
+    
+    async def call_tools_batch(self, calls: list[tuple[str, dict[str, Any]]], composite: bool = False) -> list[Any]:
+        """Llama a varias herramientas independientes y devuelve los resultados en orden
+        
+        En modo paralelo las llamadas se reparten entre las sesiones del pool;
+        en modo composite viajan juntas a una sola sesión mediante run_batch.
+        """
+        if composite:
+            return await MCPClient._call_composite(self, calls)
+        return list(await asyncio.gather(
+            *(self.call_tool(tool_name, arguments) for tool_name, arguments in calls)
+        ))
+    
+    def notify_tool(self, tool_name: str, arguments: dict[str, Any]) -> asyncio.Task:
+        """Llama a una herramienta en segundo plano sin esperar la respuesta"""
+        return MCPClient._spawn_notification(self._notifications, self.call_tool(tool_name, arguments))
+    
+    def is_connected(self) -> bool:
+        """Verifica si al menos una sesión está activa"""
+        return any(session.healthy for session in self._sessions)
+    
+    def stats(self) -> dict:
+        """Estado del pool para monitoreo"""
+        return {
+            "size": self.size,
+            "healthy": sum(session.healthy for session in self._sessions),
+            "in_flight": [session.in_flight for session in self._sessions],
+            "replacements": self.replacements,
+            "pending_notifications": len(self._notifications),
+        }
+    
+    def _pick(self) -> _PooledSession | None:
+        """Sesión sana con menos llamadas en curso"""
+        healthy = [session for session in self._sessions if session.healthy]
+        if not healthy:
+            return None
+        return min(healthy, key=lambda session: session.in_flight)
+    
+    def _schedule_replacement(self, session: _PooledSession):
+        session.healthy = False
+        if session.index not in self._replacing:
+            self._replacing.add(session.index)
+            asyncio.create_task(self._replace(session))
+    
+    async def _replace(self, session: _PooledSession):
+        """Cierra una sesión caída y levanta otra en su lugar"""
+        try:
+            await session.stop()
+            replacement = _PooledSession(session.index)
+            started = await replacement.start(self.server_script_path, self.server_args)
+            if self._closed:
+                await replacement.stop()
+            elif started:
+                self._sessions[session.index] = replacement
+                self.replacements += 1
+                logging.info(f"[MCP Pool] ✓ Sesión {session.index} reemplazada")
+            else:
+                logging.error(f"[MCP Pool] ✗ No se pudo reemplazar la sesión {session.index}")
+        finally:
+            self._replacing.discard(session.index)
+    
+    async def _health_loop(self):
+        """Revisa periódicamente las sesiones y reemplaza las que no responden"""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            for session in list(self._sessions):
+                if session.index in self._replacing:
+                    continue
+                if not session.healthy or not await session.client.ping():
+                    logging.error(f"[MCP Pool] Sesión {session.index} no responde, reemplazando...")
+                    self._schedule_replacement(session)
+
+
+def _server_args_from_env() -> list[str]:
+    """Argumentos del servidor MCP tomados del entorno (MCP_LATENCY, MCP_INVENTORY, ...)"""
+    args = []
+    for variable, flag in (("MCP_LATENCY", "--latency"), ("MCP_INVENTORY", "--inventory"),
+                           ("MCP_INVENTORY_DB", "--inventory-db"), ("MCP_SCORING_TABLES", "--scoring-tables"),
+                           ("MCP_EVENT_LOG", "--event-log")):
+        value = os.getenv(variable)
+        if value:
+            args += [flag, value]
+    return args
+
+
 # Cliente global singleton
 _mcp_client_instance: MCPClient | None = None
 _mcp_client_lock = asyncio.Lock()
@@ -143,7 +456,7 @@ async def get_mcp_client(server_path: str = "MCP/McpServer.py") -> MCPClient:
     async with _mcp_client_lock:
         if _mcp_client_instance is None:
             logging.info("[MCP Client] Inicializando cliente MCP...")
-            _mcp_client_instance = MCPClient(server_path)
+            _mcp_client_instance = MCPClient(server_path, _server_args_from_env())
             success = await _mcp_client_instance.connect()
             
             if not success:
@@ -153,11 +466,42 @@ async def get_mcp_client(server_path: str = "MCP/McpServer.py") -> MCPClient:
         return _mcp_client_instance
 
 async def cleanup_mcp_client():
-    """Cierra el cliente MCP global"""
-    global _mcp_client_instance
+    """Cierra el cliente MCP global y el pool global"""
+    global _mcp_client_instance, _mcp_pool_instance
     
     async with _mcp_client_lock:
         if _mcp_client_instance:
             await _mcp_client_instance.disconnect()
             _mcp_client_instance = None
-            logging.debug("[MCP Client] Cliente global limpiado")
\ No newline at end of file
+            logging.debug("[MCP Client] Cliente global limpiado")
+        
+        if _mcp_pool_instance:
+            await _mcp_pool_instance.disconnect()
+            _mcp_pool_instance = None
+            logging.debug("[MCP Pool] Pool global limpiado")
+
+
+# Pool global singleton
+_mcp_pool_instance: MCPClientPool | None = None
+
+async def get_mcp_client_pool(server_path: str = "MCP/McpServer.py", size: int | None = None) -> MCPClientPool:
+    """Obtiene o crea la instancia singleton del pool de clientes MCP
+    
+    Args:
+        server_path: Ruta al script del servidor MCP
+        size: Número de sesiones; por defecto MCP_POOL_SIZE o 3
+    """
+    global _mcp_pool_instance
+    
+    async with _mcp_client_lock:
+        if _mcp_pool_instance is None:
+            size = size or int(os.getenv("MCP_POOL_SIZE", "3"))
+            logging.info(f"[MCP Pool] Inicializando pool de {size} sesiones MCP...")
+            _mcp_pool_instance = MCPClientPool(server_path, size=size, server_args=_server_args_from_env())
+            success = await _mcp_pool_instance.connect()
+            
+            if not success:
+                _mcp_pool_instance = None
+                raise RuntimeError("No se pudo conectar al servidor MCP")
+        
+        return _mcp_pool_instance
\ No newline at end of file
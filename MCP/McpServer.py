@@ -1,38 +1,84 @@
 from typing import Any
+import argparse
+import json
 import logging
 import asyncio
+import os
+import sys
 from mcp.server.fastmcp import FastMCP
 
+# Permite importar los módulos del proyecto al ejecutarse como script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from MCP.EventLog import EventSink
+from MCP.Inventory import Inventory
+from MCP.InventoryStore import SQLiteInventory
+from MCP.LatencyModel import LatencyModel, latency_model_from_spec
+from MCP.QualityScoring import QualityScorer
+
 # Initialize FastMCP server
 mcp = FastMCP("restaurant-tools")
 
+# Latencia simulada por tool; se configura al iniciar el servidor
+latency_model: LatencyModel = LatencyModel()
+
+# Inventario de ingredientes; el catálogo se puede cambiar al iniciar el servidor
+DEFAULT_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "InventoryCatalog.json")
+inventory: Inventory = Inventory.from_file(DEFAULT_CATALOG)
+
+# Tablas de calidad por tipo de item; se pueden cambiar al iniciar el servidor
+quality_scorer: QualityScorer = QualityScorer()
+
+# Registro de eventos estructurados; se abre al iniciar el servidor
+event_sink: EventSink | None = None
+
 @mcp.tool()
-async def log_preparation_start(item_name: str, agent_name: str) -> str:
+async def log_preparation_start(item_name: str, agent_name: str, order_id: str = "",
+                                started_at: float | None = None) -> str:
     """Log cuando un agente comienza la preparación de un item.
     
     Args:
         item_name: Nombre del item a preparar
         agent_name: Nombre del agente que prepara
+        order_id: Identificador del pedido
+        started_at: Timestamp (epoch) del inicio según el agente
     """
+    if event_sink is not None:
+        event_sink.emit("preparation_start", agent=agent_name, item=item_name,
+                        order_id=order_id, started_at=started_at)
     message = f"[MCP LOG] {agent_name} ha iniciado la preparación de: {item_name}"
-    logging.info(message)
-    await asyncio.sleep(0.1)
+    logging.debug(message)
+    await latency_model.delay()
     return message
 
 @mcp.tool()
-async def log_preparation_complete(item_name: str, agent_name: str, preparation_time: float) -> str:
+async def log_preparation_complete(item_name: str, agent_name: str, preparation_time: float,
+                                   order_id: str = "", started_at: float | None = None,
+                                   finished_at: float | None = None) -> str:
     """Log cuando un agente completa la preparación de un item.
     
     Args:
         item_name: Nombre del item preparado
         agent_name: Nombre del agente que preparó
         preparation_time: Tiempo de preparación en segundos
+        order_id: Identificador del pedido
+        started_at: Timestamp (epoch) del inicio según el agente
+        finished_at: Timestamp (epoch) del fin según el agente
     """
+    if event_sink is not None:
+        event_sink.emit("preparation_complete", agent=agent_name, item=item_name, order_id=order_id,
+                        started_at=started_at, finished_at=finished_at, duration=preparation_time)
     message = f"[MCP LOG] {agent_name} completó {item_name} en {preparation_time:.1f}s"
-    logging.info(message)
-    await asyncio.sleep(0.1)
+    logging.debug(message)
+    await latency_model.delay()
     return message
 
+@mcp.tool()
+async def get_event_log_stats() -> str:
+    """Métricas del registro de eventos: profundidad de la cola, escritos y descartados."""
+    stats = event_sink.stats() if event_sink is not None else {}
+    return json.dumps(stats)
+
 @mcp.tool()
 async def validate_ingredients(ingredients: list[str]) -> str:
     """Valida que los ingredientes estén disponibles en inventario.
@@ -40,10 +86,7 @@ async def validate_ingredients(ingredients: list[str]) -> str:
     Args:
         ingredients: Lista de ingredientes a validar
     """
-    # Simulación de validación de inventario
-    available = ["carne", "queso", "lechuga", "tomate", "pan", "tocino", "salsa", "cebolla", "pepinillos"]
-    
-    missing = [ing for ing in ingredients if ing.lower() not in available]
+    missing = inventory.validate(ingredients)["missing"]
     
     if missing:
         message = f"[MCP LOG] Ingredientes faltantes: {', '.join(missing)}"
@@ -51,7 +94,58 @@ async def validate_ingredients(ingredients: list[str]) -> str:
         message = f"[MCP LOG] Todos los ingredientes disponibles: {', '.join(ingredients)}"
     
     logging.info(message)
-    await asyncio.sleep(0.1)
+    await latency_model.delay()
+    return message
+
+@mcp.tool()
+async def validate_ingredients_bulk(orders: dict[str, list[str]]) -> str:
+    """Valida los ingredientes de muchos pedidos en una sola llamada.
+    
+    Args:
+        orders: Ingredientes por pedido {order_id: [ingredientes]}
+    
+    Returns:
+        JSON con el resultado por pedido y si el inventario alcanza para todos
+    """
+    result = inventory.validate_bulk(orders)
+    logging.info(f"[MCP LOG] Validación en lote de {len(orders)} pedidos: "
+                 f"{'inventario suficiente' if result['all_available'] else 'inventario insuficiente'}")
+    await latency_model.delay()
+    return json.dumps(result, ensure_ascii=False)
+
+@mcp.tool()
+async def reserve_ingredients(order_id: str, ingredients: list[str]) -> str:
+    """Aparta del inventario los ingredientes de un pedido (todos o ninguno).
+    
+    Args:
+        order_id: Identificador del pedido
+        ingredients: Lista de ingredientes a apartar
+    """
+    result = inventory.reserve(order_id, ingredients)
+    
+    if result["reserved"]:
+        message = f"[MCP LOG] Ingredientes apartados para {order_id}: {', '.join(ingredients)}"
+    else:
+        message = f"[MCP LOG] No se pudo apartar para {order_id}, faltan: {', '.join(result['missing'])}"
+    
+    logging.info(message)
+    await latency_model.delay()
+    return message
+
+@mcp.tool()
+async def release_ingredients(order_id: str) -> str:
+    """Devuelve al inventario los ingredientes apartados para un pedido.
+    
+    Args:
+        order_id: Identificador del pedido
+    """
+    if inventory.release(order_id):
+        message = f"[MCP LOG] Ingredientes de {order_id} devueltos al inventario"
+    else:
+        message = f"[MCP LOG] No hay ingredientes apartados para {order_id}"
+    
+    logging.info(message)
+    await latency_model.delay()
     return message
 
 @mcp.tool()
@@ -62,38 +156,112 @@ async def get_quality_score(item_type: str, preparation_time: float) -> str:
         item_type: Tipo de item (hamburguesa, pizza, hotdog)
         preparation_time: Tiempo que tomó preparar
     """
-
-    ideal_times = {
-        "hamburguesa": 5.0,
-        "pizza": 8.0,
-        "hotdog": 3.0
-    }
-    
-    ideal = ideal_times.get(item_type.lower(), 5.0)
-    difference = abs(preparation_time - ideal)
-    
-    if difference < 1.0:
-        quality = "Premium"
-        score = 95
-    elif difference < 2.0:
-        quality = "Excelente"
-        score = 85
-    elif difference < 3.0:
-        quality = "Muy Buena"
-        score = 75
-    else:
-        quality = "Buena"
-        score = 65
+    quality, score = quality_scorer.score(item_type, preparation_time)
     
     message = f"[MCP LOG] Score de calidad para {item_type}: {quality} ({score}/100)"
     logging.info(message)
-    await asyncio.sleep(0.1)
+    await latency_model.delay()
     return message
 
+@mcp.tool()
+async def get_quality_scores_batch(item_types: list[str], preparation_times: list[float]) -> str:
+    """Calcula en una sola pasada los scores de calidad de muchas preparaciones.
+    
+    Args:
+        item_types: Tipo de item de cada preparación
+        preparation_times: Tiempo de cada preparación, en el mismo orden
+    
+    Returns:
+        JSON compacto con las etiquetas distintas, el índice de etiqueta y el
+        score de cada preparación, y el promedio por tipo de item
+    """
+    result = quality_scorer.score_batch(item_types, preparation_times)
+    logging.info(f"[MCP LOG] Scores de calidad calculados para {len(item_types)} preparaciones")
+    await latency_model.delay()
+    return json.dumps(result, ensure_ascii=False)
+
+# Tools que pueden ejecutarse dentro de run_batch
+BATCHABLE_TOOLS = {
+    "log_preparation_start": log_preparation_start,
+    "log_preparation_complete": log_preparation_complete,
+    "validate_ingredients": validate_ingredients,
+    "reserve_ingredients": reserve_ingredients,
+    "release_ingredients": release_ingredients,
+    "get_quality_score": get_quality_score,
+}
+
+@mcp.tool()
+async def run_batch(operations: list[dict[str, Any]]) -> str:
+    """Ejecuta varias tools independientes en una sola llamada.
+    
+    Args:
+        operations: Lista de operaciones {"tool": nombre, "arguments": {...}}
+    
+    Returns:
+        Lista JSON con el resultado de cada operación, en el mismo orden
+    """
+    async def run(operation: dict[str, Any]) -> str | None:
+        tool = BATCHABLE_TOOLS.get(operation.get("tool"))
+        if tool is None:
+            logging.error(f"[MCP LOG] Tool desconocida en lote: {operation.get('tool')}")
+            return None
+        try:
+            return await tool(**operation.get("arguments", {}))
+        except Exception as e:
+            logging.error(f"[MCP LOG] Error en {operation.get('tool')}: {e}")
+            return None
+    
+    results = await asyncio.gather(*(run(operation) for operation in operations))
+    return json.dumps(results, ensure_ascii=False)
+
 def main():
     """Initialize and run the MCP server"""
-    logging.info("Iniciando servidor MCP para Restaurant Tools...")
-    mcp.run(transport='stdio')
+    global latency_model, inventory, quality_scorer, event_sink
+    
+    parser = argparse.ArgumentParser(description="Servidor MCP de Restaurant Tools")
+    parser.add_argument(
+        "--latency",
+        default=os.getenv("MCP_LATENCY", "none"),
+        help='Latencia simulada por tool: "none", "fixed:0.1", "uniform:0.05,0.2", ...'
+    )
+    parser.add_argument(
+        "--inventory",
+        default=os.getenv("MCP_INVENTORY", DEFAULT_CATALOG),
+        help="Archivo JSON con el catálogo de ingredientes y sus existencias"
+    )
+    parser.add_argument(
+        "--inventory-db",
+        default=os.getenv("MCP_INVENTORY_DB"),
+        help="Base SQLite para compartir y persistir el inventario entre servidores"
+    )
+    parser.add_argument(
+        "--scoring-tables",
+        default=os.getenv("MCP_SCORING_TABLES"),
+        help="Archivo JSON con las tablas de calidad por tipo de item"
+    )
+    parser.add_argument(
+        "--event-log",
+        default=os.getenv("MCP_EVENT_LOG", "none"),
+        help='Archivo JSON-lines de eventos ("{pid}" se reemplaza por el PID, para un archivo '
+             'por proceso del pool); por defecto "none", desactivado'
+    )
+    args = parser.parse_args()
+    latency_model = latency_model_from_spec(args.latency)
+    if args.event_log != "none":
+        event_sink = EventSink(args.event_log.format(pid=os.getpid()))
+    if args.scoring_tables:
+        quality_scorer = QualityScorer.from_file(args.scoring_tables)
+    if args.inventory_db:
+        inventory = SQLiteInventory.from_file(args.inventory, args.inventory_db)
+    elif args.inventory != DEFAULT_CATALOG:
+        inventory = Inventory.from_file(args.inventory)
+    
+    logging.info(f"Iniciando servidor MCP para Restaurant Tools (latencia: {latency_model})...")
+    try:
+        mcp.run(transport='stdio')
+    finally:
+        if event_sink is not None:
+            event_sink.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
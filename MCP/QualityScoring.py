@@ -0,0 +1,142 @@
+import json
+from typing import Dict, Sequence
+import numpy as np
+
+
+class ScoringTable:
+    """Tabla de calidad de un tipo de item
+
+    La calidad depende de cuánto se aleja el tiempo de preparación del
+    tiempo ideal: el primer umbral que la diferencia no alcanza define la
+    etiqueta y el score; si los supera todos se usa el valor por defecto.
+    """
+
+    def __init__(self, ideal_time: float, thresholds: Sequence[tuple[float, str, int]],
+                 default: tuple[str, int] = ("Buena", 65)):
+        self.ideal_time = ideal_time
+        self.thresholds = sorted(thresholds)
+        self.default = default
+
+    def score(self, preparation_time: float) -> tuple[str, int]:
+        """Etiqueta y score de una sola preparación"""
+        difference = abs(preparation_time - self.ideal_time)
+        for limit, label, score in self.thresholds:
+            if difference < limit:
+                return label, score
+        return self.default
+
+
+DEFAULT_THRESHOLDS = [
+    (1.0, "Premium", 95),
+    (2.0, "Excelente", 85),
+    (3.0, "Muy Buena", 75),
+]
+
+DEFAULT_TABLES: Dict[str, ScoringTable] = {
+    "hamburguesa": ScoringTable(5.0, DEFAULT_THRESHOLDS),
+    "pizza": ScoringTable(8.0, DEFAULT_THRESHOLDS),
+    "hotdog": ScoringTable(3.0, DEFAULT_THRESHOLDS),
+}
+
+# Tabla para tipos de item sin configuración propia
+FALLBACK_TABLE = ScoringTable(5.0, DEFAULT_THRESHOLDS)
+
+
+class QualityScorer:
+    """Calcula scores de calidad, uno a uno o en lote con NumPy
+
+    En lote, los umbrales de todas las tablas se empacan en matrices
+    (rellenando con infinito las tablas con menos umbrales) para evaluar
+    todas las preparaciones en una sola pasada vectorizada.
+    """
+
+    def __init__(self, tables: Dict[str, ScoringTable] | None = None, fallback: ScoringTable = FALLBACK_TABLE):
+        self.tables = {name.lower(): table for name, table in (tables or DEFAULT_TABLES).items()}
+        self.fallback = fallback
+        self._pack()
+
+    @classmethod
+    def from_file(cls, path: str) -> "QualityScorer":
+        """Carga las tablas desde JSON {item: {"ideal_time", "thresholds": [[limite, etiqueta, score]], "default"}}"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls({
+            name: ScoringTable(
+                entry["ideal_time"],
+                [tuple(threshold) for threshold in entry.get("thresholds", DEFAULT_THRESHOLDS)],
+                tuple(entry.get("default", ("Buena", 65))),
+            )
+            for name, entry in data.items()
+        })
+
+    def score(self, item_type: str, preparation_time: float) -> tuple[str, int]:
+        """Etiqueta y score de una sola preparación"""
+        return self.tables.get(item_type.lower(), self.fallback).score(preparation_time)
+
+    def score_batch(self, item_types: Sequence[str], preparation_times: Sequence[float]) -> dict:
+        """Calcula los scores de muchas preparaciones en una pasada vectorizada
+
+        Returns:
+            Resultado compacto: lista de etiquetas distintas, índice de
+            etiqueta y score por preparación, y promedio por tipo de item
+        """
+        if len(item_types) != len(preparation_times):
+            raise ValueError("item_types y preparation_times deben tener el mismo largo")
+        if not item_types:
+            return {"labels": [], "label_index": [], "scores": [], "mean_by_item": {}}
+
+        # Factoriza los tipos (más rápido que np.unique con strings) y obtiene
+        # la fila de tabla de cada preparación; los desconocidos usan el fallback
+        codes = {}
+        inverse = np.fromiter((codes.setdefault(t, len(codes)) for t in item_types),
+                              dtype=np.intp, count=len(item_types))
+        names = [t.lower() for t in codes]
+        table_rows = np.array([self._row.get(name, self._fallback_row) for name in names])[inverse]
+
+        times = np.asarray(preparation_times, dtype=float)
+        difference = np.abs(times - self._ideal[table_rows])
+
+        # Primer umbral que la diferencia no alcanza; la columna extra es el valor por defecto
+        below = difference[:, None] < self._limits[table_rows]
+        level = np.argmax(below, axis=1)
+        scores = self._scores[table_rows, level]
+        label_index = self._label_ids[table_rows, level]
+
+        # Promedio por tipo de item (agrupando mayúsculas/minúsculas)
+        name_ids = {name: i for i, name in enumerate(dict.fromkeys(names))}
+        groups = np.array([name_ids[name] for name in names])[inverse]
+        totals = np.bincount(groups, weights=scores, minlength=len(name_ids))
+        counts = np.bincount(groups, minlength=len(name_ids))
+        means = {name: float(totals[i] / counts[i]) for name, i in name_ids.items()}
+        return {
+            "labels": self._labels,
+            "label_index": label_index.tolist(),
+            "scores": scores.tolist(),
+            "mean_by_item": means,
+        }
+
+    def _pack(self):
+        """Empaca las tablas en matrices para la evaluación vectorizada"""
+        tables = list(self.tables.values()) + [self.fallback]
+        self._row = {name: i for i, name in enumerate(self.tables)}
+        self._fallback_row = len(tables) - 1
+
+        labels = sorted({label for table in tables for _, label, _ in table.thresholds} |
+                        {table.default[0] for table in tables})
+        label_id = {label: i for i, label in enumerate(labels)}
+        width = max(len(table.thresholds) for table in tables) + 1
+
+        self._labels = labels
+        self._ideal = np.array([table.ideal_time for table in tables], dtype=float)
+        self._limits = np.full((len(tables), width), np.inf)
+        self._scores = np.zeros((len(tables), width), dtype=int)
+        self._label_ids = np.zeros((len(tables), width), dtype=int)
+
+        for row, table in enumerate(tables):
+            levels = list(table.thresholds)
+            # Los niveles que faltan repiten el valor por defecto con límite infinito
+            levels += [(np.inf, *table.default)] * (width - len(levels))
+            for column, (limit, label, score) in enumerate(levels):
+                self._limits[row, column] = limit
+                self._scores[row, column] = score
+                self._label_ids[row, column] = label_id[label]
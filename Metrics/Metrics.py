@@ -0,0 +1,212 @@
+import json
+import math
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class Counter:
+    """Valor que solo crece (llamadas, errores...)"""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def snapshot(self) -> dict:
+        return {"value": self.value}
+
+
+class Gauge:
+    """Valor que sube y baja (tareas en vuelo, tamaño de una cola...)"""
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def snapshot(self) -> dict:
+        return {"value": self.value}
+
+
+class Histogram:
+    """Histograma de latencias al estilo HDR
+
+    Los valores se guardan en microsegundos en cubetas log-lineales: cada
+    potencia de dos se divide en 2**precision_bits sub-cubetas, así que el
+    error relativo de los percentiles es menor a 1/2**precision_bits (0.8%
+    con 7 bits) sin importar si el valor es de microsegundos o de minutos.
+    Solo se guardan las cubetas usadas, y registrar un valor es O(1).
+    """
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, precision_bits: int = 7):
+        self.precision_bits = precision_bits
+        self.count = 0
+        self.sum = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self._buckets: Dict[tuple, int] = {}
+
+    def record(self, seconds: float):
+        micros = max(0, int(seconds * 1_000_000))
+        magnitude = max(0, micros.bit_length() - self.precision_bits)
+        bucket = (magnitude, micros >> magnitude)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, quantile: float) -> float:
+        """Valor por debajo del cual cae la fracción quantile de las muestras, en segundos"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(quantile * self.count))
+        seen = 0
+        for magnitude, sub in sorted(self._buckets, key=lambda bucket: bucket[1] << bucket[0]):
+            seen += self._buckets[(magnitude, sub)]
+            if seen >= rank:
+                # Punto medio de la cubeta, acotado a los extremos observados
+                micros = (sub << magnitude) + ((1 << magnitude) - 1) / 2
+                return min(self.max, max(self.min, micros / 1_000_000))
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            **{f"p{int(quantile * 100)}": self.percentile(quantile) for quantile in self.QUANTILES},
+        }
+
+
+class MetricsRegistry:
+    """Contadores, gauges e histogramas del proceso, identificados por nombre y etiquetas
+
+    Pensado para el camino caliente: registrar una medición es una búsqueda
+    en un diccionario y una suma. No usa locks; todas las mediciones se
+    hacen desde el event loop del proceso. Cada proceso (workers de
+    uvicorn, procesos de agentes) tiene su propio registro.
+    """
+
+    TYPES = {Counter: "counter", Gauge: "gauge", Histogram: "summary"}
+
+    def __init__(self, namespace: str = "restaurant"):
+        self.namespace = namespace
+        self._metrics: Dict[tuple, object] = {}
+        self._kinds: Dict[str, type] = {}
+        self._help: Dict[str, str] = {}
+
+    def counter(self, name: str, help: str = "", **labels) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str = "", **labels) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name: str, help: str = "", **labels) -> Histogram:
+        return self._get(Histogram, name, help, labels)
+
+    @contextmanager
+    def track(self, name: str, help: str = "", **labels) -> Iterator[None]:
+        """Mide un bloque: duración en {name}_seconds, en curso en {name}_in_flight
+        y excepciones en {name}_errors_total"""
+        in_flight = self.gauge(f"{name}_in_flight", help and f"{help} en curso", **labels)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.counter(f"{name}_errors_total", help and f"{help} con error", **labels).inc()
+            raise
+        finally:
+            in_flight.dec()
+            self.histogram(f"{name}_seconds", help and f"{help} (segundos)", **labels).record(time.perf_counter() - start)
+
+    def series(self, kind: type = None) -> Iterator[tuple]:
+        """(nombre, etiquetas, métrica) de cada serie registrada, opcionalmente de un tipo"""
+        for (name, labels), metric in sorted(self._metrics.items(), key=lambda item: item[0]):
+            if kind is None or isinstance(metric, kind):
+                yield name, dict(labels), metric
+
+    def to_dict(self) -> dict:
+        """Todas las series en un diccionario serializable a JSON"""
+        result = {}
+        for name, labels, metric in self.series():
+            entry = result.setdefault(name, {
+                "type": self.TYPES[type(metric)],
+                "help": self._help.get(name, ""),
+                "series": [],
+            })
+            entry["series"].append({"labels": labels, **metric.snapshot()})
+        return result
+
+    def to_prometheus(self) -> str:
+        """Todas las series en el formato de texto de Prometheus
+
+        Los histogramas se exportan como summary con cuantiles 0.5, 0.95 y 0.99.
+        """
+        lines = []
+        current = None
+        for name, labels, metric in self.series():
+            full_name = f"{self.namespace}_{name}" if self.namespace else name
+            if name != current:
+                current = name
+                if self._help.get(name):
+                    lines.append(f"# HELP {full_name} {self._help[name]}")
+                lines.append(f"# TYPE {full_name} {self.TYPES[type(metric)]}")
+            if isinstance(metric, Histogram):
+                for quantile in Histogram.QUANTILES:
+                    lines.append(f"{full_name}{_labels(labels, quantile=quantile)} {metric.percentile(quantile):.6f}")
+                lines.append(f"{full_name}_sum{_labels(labels)} {metric.sum:.6f}")
+                lines.append(f"{full_name}_count{_labels(labels)} {metric.count}")
+            else:
+                lines.append(f"{full_name}{_labels(labels)} {metric.value:g}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, format: str = "prometheus") -> str:
+        """Exporta las métricas en formato prometheus (texto) o json"""
+        if format == "prometheus":
+            return self.to_prometheus()
+        if format == "json":
+            return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        raise ValueError(f"Formato de métricas desconocido: {format}")
+
+    def reset(self):
+        self._metrics.clear()
+
+    def _get(self, kind: type, name: str, help: str, labels: dict):
+        key = (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            if self._kinds.setdefault(name, kind) is not kind:
+                raise ValueError(f"La métrica {name} ya está registrada como {self.TYPES[self._kinds[name]]}")
+            if help:
+                self._help.setdefault(name, help)
+            metric = self._metrics[key] = kind()
+        return metric
+
+
+def _labels(labels: dict, **extra) -> str:
+    labels = {**labels, **{name: str(value) for name, value in extra.items()}}
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Registro compartido por todo el proceso
+metrics = MetricsRegistry()
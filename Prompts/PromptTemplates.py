@@ -94,4 +94,49 @@ orchestrator_prompt_template = ChatPromptTemplate.from_messages([
             )
 ])
 
+orchestrator_batch_prompt_template = ChatPromptTemplate.from_messages([
+    (
+        "system",
+        """You are a highly experienced orchestrator agent in a multi-agent system.
+        Your specialty is analyzing different AgentCards and AgentSkills to intelligently route tasks to the most appropriate specialized agents.
+        You will receive a numbered list of orders and must assign each one to the agent best suited to handle it.
+
+
+        ### Output Format
+
+        You MUST respond only with a JSON object that maps each order number to an agent name, without any additional text or formatting.
+        Include every order number exactly once.
+        Do not modify the agent names in any way, just return them as they are on the Agent Cards.
+        """
+    ),
+
+    (
+        "user",
+        """
+        Orders:
+        1. I want to order a cheeseburger with extra bacon and a side of fries.
+        2. I want to order a pizza with pepperoni and extra cheese.
+
+        Here are the available AgentCards and Skills:
+        Name: “Hamburguesa Chef” Tags: hamburguesa, carne, parrilla, comida rápida, gourmet
+        Name: “Hot Dog Master” Tags: hot dog, salchicha, comida rápida, artesanal
+        Name: “Pizza Artisan” Tags: pizza, horno, masa, italiano, artesanal, napolitana
+        """
+    ),
+
+    (
+        "assistant",
+        """{{"1": "Hamburguesa Chef", "2": "Pizza Artisan"}}"""
+    ),
+
+    (
+        "user",
+        """```
+        Orders:
+        {orders}
+        Here are the available AgentCards and Skills: {AgentCards}
+        ```"""
+    )
+])
+
 # TODO: Agregar los prompts para los agentes especializados para que obtengan sus tools de forma dinamica 
\ No newline at end of file
@@ -0,0 +1,197 @@
+import json
+import os
+from typing import Dict, Iterable, List
+from Recipes.StepScheduler import critical_path
+from Routing.TextNormalization import normalize_text
+
+# Directorio con los archivos de menú incluidos en el proyecto
+DEFAULT_MENU_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Menu")
+
+
+class RecipeStep:
+    """Paso de una receta con su duración, los pasos de los que depende y la estación que ocupa"""
+
+    def __init__(self, id: str, description: str, duration: float,
+                 after: Iterable[str] = (), uses_ingredients: bool = False, station: str | None = None):
+        self.id = id
+        self.description = description
+        self.duration = duration
+        self.after = tuple(after)
+        self.uses_ingredients = uses_ingredients
+        self.station = station
+
+
+class Recipe:
+    """Platillo del menú: pasos, ingredientes y textos del resultado"""
+
+    def __init__(self, id: str, name: str, item: str, steps: List[RecipeStep],
+                 ingredients: Iterable[str] = (), quality_type: str | None = None,
+                 keywords: Iterable[str] = (), qualities: Iterable[str] = ("buena",),
+                 details: Dict[str, str] | None = None, messages: Dict[str, str] | None = None):
+        self.id = id
+        self.name = name
+        self.item = item
+        self.steps = steps
+        self.ingredients = list(ingredients)
+        self.quality_type = quality_type or item
+        self.keywords = [normalize_text(keyword) for keyword in keywords]
+        self.qualities = list(qualities)
+        self.details = dict(details or {})
+        self.messages = dict(messages or {})
+        # Tiempo mínimo de preparación corriendo en paralelo los pasos independientes
+        self.preparation_time, self.critical_steps = critical_path(steps)
+
+    @property
+    def total_time(self) -> float:
+        """Suma de las duraciones de todos los pasos (ejecución en serie)"""
+        return sum(step.duration for step in self.steps)
+
+    def match_score(self, normalized_text: str) -> int:
+        """Número de palabras clave de la receta presentes en el pedido"""
+        padded = f" {normalized_text} "
+        return sum(f" {keyword} " in padded for keyword in self.keywords)
+
+
+class ChefDefinition:
+    """Agente cocinero descrito por datos: su AgentCard, estaciones y las recetas que prepara"""
+
+    def __init__(self, name: str, description: str, url: str, skills: List[dict],
+                 recipes: List[Recipe], version: str = "1.0.0", source: str = "",
+                 stations: Dict[str, int] | None = None):
+        self.name = name
+        self.description = description
+        self.url = url
+        self.skills = skills
+        self.recipes = recipes
+        self.version = version
+        self.source = source
+        # Estación → número de unidades (p. ej. {"horno": 2})
+        self.stations = dict(stations or {})
+
+    def select_recipe(self, text: str) -> Recipe:
+        """Receta que mejor coincide con el texto del pedido; la primera si ninguna coincide"""
+        normalized = normalize_text(text)
+        return max(self.recipes, key=lambda recipe: recipe.match_score(normalized))
+
+
+class RecipeBook:
+    """Menú completo cargado desde archivos JSON, uno por agente cocinero
+
+    Cada archivo describe el AgentCard del cocinero y sus recetas. Los
+    archivos se leen y validan una sola vez al crear el libro; un error en
+    cualquiera detiene la carga con un ValueError que indica el archivo y la
+    receta.
+    """
+
+    def __init__(self, chefs: List[ChefDefinition]):
+        self.chefs = chefs
+        self.recipes: Dict[str, Recipe] = {}
+        names = set()
+        for chef in chefs:
+            if chef.name in names:
+                raise ValueError(f"Agente duplicado en el menú: {chef.name} ({chef.source})")
+            names.add(chef.name)
+            for recipe in chef.recipes:
+                if recipe.id in self.recipes:
+                    raise ValueError(f"Receta duplicada en el menú: {recipe.id} ({chef.source})")
+                self.recipes[recipe.id] = recipe
+
+    @classmethod
+    def from_directory(cls, path: str = DEFAULT_MENU_DIR) -> "RecipeBook":
+        """Carga todos los archivos .json del directorio, en orden alfabético"""
+        files = sorted(name for name in os.listdir(path) if name.endswith(".json"))
+        if not files:
+            raise ValueError(f"No hay archivos de menú en {path}")
+        return cls([load_chef(os.path.join(path, name)) for name in files])
+
+    def get_chef(self, name: str) -> ChefDefinition | None:
+        for chef in self.chefs:
+            if chef.name == name:
+                return chef
+        return None
+
+
+def load_chef(path: str) -> ChefDefinition:
+    """Lee y valida un archivo de menú {"chef": {...}, "recipes": [...]}"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    try:
+        chef = data["chef"]
+        skills = chef["skills"]
+        if not skills:
+            raise ValueError("el agente necesita al menos una skill")
+        for skill in skills:
+            for field in ("id", "name", "description"):
+                if not skill.get(field):
+                    raise ValueError(f"skill sin {field}")
+        stations = chef.get("stations", {})
+        if not isinstance(stations, dict):
+            raise ValueError("stations debe ser un objeto {estación: capacidad}")
+        for station, capacity in stations.items():
+            if isinstance(capacity, bool) or not isinstance(capacity, int) or capacity < 1:
+                raise ValueError(f"la estación {station} necesita una capacidad entera positiva")
+        recipes = [_parse_recipe(entry) for entry in data["recipes"]]
+        if not recipes:
+            raise ValueError("el agente necesita al menos una receta")
+        for recipe in recipes:
+            for step in recipe.steps:
+                if step.station is not None and (not isinstance(step.station, str) or step.station not in stations):
+                    raise ValueError(f"el paso {step.id} de la receta {recipe.id} usa la estación "
+                                     f"no definida {step.station}")
+        return ChefDefinition(
+            name=chef["name"],
+            description=chef.get("description", ""),
+            url=chef["url"],
+            skills=skills,
+            recipes=recipes,
+            version=chef.get("version", "1.0.0"),
+            source=path,
+            stations=stations,
+        )
+    except KeyError as e:
+        raise ValueError(f"Menú inválido en {path}: falta el campo {e}") from None
+    except ValueError as e:
+        raise ValueError(f"Menú inválido en {path}: {e}") from None
+
+
+def _parse_recipe(entry: dict) -> Recipe:
+    recipe_id = entry["id"]
+    steps = []
+    seen = set()
+    for raw in entry["steps"]:
+        step = RecipeStep(
+            id=raw["id"],
+            description=raw["description"],
+            duration=float(raw["duration"]),
+            after=raw.get("after", ()),
+            uses_ingredients=bool(raw.get("uses_ingredients", False)),
+            station=raw.get("station"),
+        )
+        if step.id in seen:
+            raise ValueError(f"paso duplicado {step.id} en la receta {recipe_id}")
+        if step.duration <= 0:
+            raise ValueError(f"duración no positiva en el paso {step.id} de la receta {recipe_id}")
+        # Solo se puede depender de pasos listados antes: así no hay ciclos y
+        # el orden del archivo siempre es un orden válido de ejecución
+        unknown = [dependency for dependency in step.after if dependency not in seen]
+        if unknown:
+            raise ValueError(f"el paso {step.id} de la receta {recipe_id} depende de pasos "
+                             f"no definidos antes: {', '.join(unknown)}")
+        seen.add(step.id)
+        steps.append(step)
+    if not steps:
+        raise ValueError(f"la receta {recipe_id} no tiene pasos")
+
+    return Recipe(
+        id=recipe_id,
+        name=entry["name"],
+        item=entry["item"],
+        steps=steps,
+        ingredients=entry.get("ingredients", ()),
+        quality_type=entry.get("quality_type"),
+        keywords=entry.get("keywords", ()),
+        qualities=entry.get("qualities", ("buena",)),
+        details=entry.get("details"),
+        messages=entry.get("messages"),
+    )
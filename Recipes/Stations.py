@@ -0,0 +1,121 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, nullcontext
+from typing import Dict
+
+
+class Station:
+    """Estación de cocina con capacidad limitada (hornos, parrillas, freidoras)
+
+    Funciona como un semáforo asíncrono con cola FIFO: los pasos que piden
+    la estación esperan su turno cuando todas las unidades están ocupadas.
+    Lleva métricas de cola, espera y utilización para dimensionar la cocina.
+    """
+
+    def __init__(self, name: str, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"La estación {name} necesita capacidad positiva")
+        self.name = name
+        self.capacity = capacity
+        self.in_use = 0
+        self.acquired = 0
+        self.max_queued = 0
+        self.total_wait = 0.0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._busy_time = 0.0
+        self._since = time.monotonic()
+        self._last_change = self._since
+
+    @asynccontextmanager
+    async def use(self):
+        """Ocupa una unidad de la estación mientras dura el bloque"""
+        await self.acquire()
+        try:
+            yield self
+        finally:
+            self.release()
+
+    async def acquire(self):
+        requested = time.monotonic()
+        if self.in_use < self.capacity and not self._waiters:
+            self._change_in_use(+1)
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self.max_queued = max(self.max_queued, len(self._waiters))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Ya se le había cedido la unidad: pasarla al siguiente
+                    self.release()
+                else:
+                    self._waiters.remove(waiter)
+                raise
+        self.acquired += 1
+        self.total_wait += time.monotonic() - requested
+
+    def release(self):
+        # La unidad pasa directo al siguiente en la cola, sin cambiar in_use
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._change_in_use(-1)
+
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def stats(self) -> dict:
+        """Métricas de la estación desde su creación o el último reset"""
+        now = time.monotonic()
+        busy = self._busy_time + self.in_use * (now - self._last_change)
+        elapsed = now - self._since
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "queued": len(self._waiters),
+            "max_queued": self.max_queued,
+            "acquired": self.acquired,
+            "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+            "utilization": busy / (self.capacity * elapsed) if elapsed > 0 else 0.0,
+        }
+
+    def reset_stats(self):
+        now = time.monotonic()
+        self.acquired = 0
+        self.max_queued = len(self._waiters)
+        self.total_wait = 0.0
+        self._busy_time = 0.0
+        self._since = now
+        self._last_change = now
+
+    def _change_in_use(self, delta: int):
+        now = time.monotonic()
+        self._busy_time += self.in_use * (now - self._last_change)
+        self._last_change = now
+        self.in_use += delta
+
+
+class Kitchen:
+    """Conjunto de estaciones de un agente cocinero"""
+
+    def __init__(self, capacities: Dict[str, int] | None = None):
+        self.stations: Dict[str, Station] = {
+            name: Station(name, capacity) for name, capacity in (capacities or {}).items()
+        }
+
+    def use(self, station: str | None):
+        """Contexto que ocupa la estación indicada; sin estación no hay que esperar"""
+        if station is None:
+            return nullcontext()
+        return self.stations[station].use()
+
+    def stats(self) -> Dict[str, dict]:
+        return {name: station.stats() for name, station in self.stations.items()}
+
+    def reset_stats(self):
+        for station in self.stations.values():
+            station.reset_stats()
@@ -0,0 +1,62 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Sequence
+
+
+def critical_path(steps: Sequence) -> tuple[float, List[str]]:
+    """Duración mínima de la receta y pasos de la ruta crítica
+
+    Los pasos deben venir en un orden válido (cada uno después de los pasos
+    de los que depende), como garantiza RecipeBook al cargar el menú.
+    """
+    finish: Dict[str, float] = {}
+    previous: Dict[str, str | None] = {}
+    for step in steps:
+        start, before = 0.0, None
+        for dependency in step.after:
+            if finish[dependency] > start:
+                start, before = finish[dependency], dependency
+        finish[step.id] = start + step.duration
+        previous[step.id] = before
+
+    if not finish:
+        return 0.0, []
+    last = max(finish, key=finish.get)
+    path = []
+    while last is not None:
+        path.append(last)
+        last = previous[last]
+    return finish[path[0]], path[::-1]
+
+
+class StepScheduler:
+    """Ejecuta los pasos de una receta según su grafo de dependencias
+
+    Cada paso arranca en cuanto terminan los pasos de los que depende, de
+    modo que los pasos independientes (p. ej. tostar el pan y asar la carne)
+    corren en paralelo. Si un paso falla se cancelan los demás.
+    """
+
+    def __init__(self, steps: Sequence):
+        self.steps = list(steps)
+
+    async def run(self, execute: Callable[[object], Awaitable[None]]):
+        """Ejecuta execute(step) para cada paso respetando las dependencias"""
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_step(step, dependencies: List[asyncio.Task]):
+            if dependencies:
+                await asyncio.gather(*dependencies)
+            await execute(step)
+
+        for step in self.steps:
+            tasks[step.id] = asyncio.create_task(
+                run_step(step, [tasks[dependency] for dependency in step.after])
+            )
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
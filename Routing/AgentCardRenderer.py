@@ -0,0 +1,42 @@
+from typing import Dict
+from Routing.TokenCounter import count_tokens
+
+
+def render_routing_card(name: str, card) -> str:
+    """Representación compacta de un AgentCard con solo lo que necesita el router
+
+    Omite URL, versión y modos de entrada/salida, que no influyen en la
+    decisión de routing.
+    """
+    lines = [f"Name: “{name}” — {card.description}"]
+    for skill in card.skills:
+        lines.append(f"  • {skill.name}: {skill.description}")
+        if skill.tags:
+            lines.append(f"    Tags: {', '.join(skill.tags)}")
+        if skill.examples:
+            lines.append(f"    Ejemplos: {' · '.join(skill.examples)}")
+    return "\n".join(lines)
+
+
+class AgentCardRenderer:
+    """Mantiene el texto de routing de los AgentCards, renderizado una vez por registro"""
+
+    def __init__(self):
+        self.text = ""
+        self.tokens = 0
+        self._rendered: Dict[str, tuple] = {}
+
+    def update(self, agents: Dict) -> str:
+        """Renderiza los AgentCards nuevos y reutiliza los ya registrados"""
+        rendered = {}
+        for name, agent in agents.items():
+            cached = self._rendered.get(name)
+            if cached is not None and cached[0] is agent.agent_card:
+                rendered[name] = cached
+            else:
+                rendered[name] = (agent.agent_card, render_routing_card(name, agent.agent_card))
+
+        self._rendered = rendered
+        self.text = "\n\n".join(text for _, text in rendered.values())
+        self.tokens = count_tokens(self.text)
+        return self.text
@@ -0,0 +1,35 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class RequestCoalescer:
+    """Agrupa peticiones idénticas en vuelo para que compartan una sola ejecución
+
+    La primera corrutina que pide una llave lanza la operación; las que
+    llegan mientras sigue en curso esperan el mismo resultado. Cancelar a
+    uno de los que esperan no cancela la operación compartida.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Ejecuta factory() para la llave, o se une a la ejecución en curso"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(factory())
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(future)
+
+    def in_flight(self) -> int:
+        """Número de operaciones distintas en curso"""
+        return len(self._inflight)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict
+from Routing.TextNormalization import normalize_text
+
+
+class RoutingCache:
+    """Cache LRU con TTL para las decisiones de routing del orquestador
+
+    Las entradas se indexan por la descripción normalizada del pedido y la
+    huella de los AgentCards registrados, de modo que un cambio en los
+    agentes nunca devuelve una decisión tomada con otro conjunto.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.fingerprint = ""
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple[str, str], tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(description: str) -> str:
+        """Normaliza la descripción del pedido para usarla como llave"""
+        return normalize_text(description)
+
+    @staticmethod
+    def fingerprint_agents(agents: Dict) -> str:
+        """Calcula una huella estable de los agentes registrados y sus AgentCards"""
+        canonical = json.dumps(
+            {name: agent.agent_card.to_dict() for name, agent in agents.items()},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def set_fingerprint(self, fingerprint: str) -> bool:
+        """Actualiza la huella de agentes e invalida el cache si cambió
+
+        Returns:
+            True si la huella cambió y el cache fue vaciado
+        """
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return False
+            self.fingerprint = fingerprint
+            self._entries.clear()
+            return True
+
+    def get(self, description: str) -> str | None:
+        """Devuelve el agente cacheado para el pedido, o None si no existe o expiró"""
+        key = (self.normalize(description), self.fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                agent_name, expires_at = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return agent_name
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, description: str, agent_name: str):
+        """Guarda la decisión de routing, desalojando la entrada menos usada si está lleno"""
+        key = (self.normalize(description), self.fingerprint)
+        with self._lock:
+            self._entries[key] = (agent_name, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Vacía el cache y reinicia los contadores"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Estadísticas del cache para monitoreo"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
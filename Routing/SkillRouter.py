@@ -0,0 +1,109 @@
+import logging
+from collections import defaultdict
+from typing import Dict
+from Routing.TextNormalization import normalize_text
+
+# Palabras que no aportan información para distinguir entre agentes
+STOPWORDS = {
+    "un", "una", "unos", "unas", "el", "la", "los", "las", "de", "del", "con",
+    "sin", "y", "o", "en", "al", "a", "por", "para", "todas", "todos", "mi",
+    "quiero", "preparar", "prepara", "dame", "favor", "extra", "grande",
+}
+
+
+def _stem(word: str) -> str:
+    """Reducción mínima de plurales (hamburguesas → hamburguesa)"""
+    if len(word) > 4 and word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+def _terms(text: str) -> list[str]:
+    """Tokens normalizados y sin stopwords de un texto"""
+    return [_stem(word) for word in normalize_text(text).split() if word not in STOPWORDS and len(word) > 2]
+
+
+class SkillRouter:
+    """Router local que asigna pedidos usando los tags y ejemplos de las AgentSkills
+
+    Construye un índice invertido término → agentes a partir de las skills y
+    puntúa cada pedido sin llamar al LLM. Los términos compartidos por varios
+    agentes pesan menos, y solo se devuelve una decisión cuando el mejor
+    agente supera el umbral y aventaja claramente al segundo.
+    """
+
+    TAG_WEIGHT = 3.0
+    EXAMPLE_WEIGHT = 1.0
+
+    def __init__(self, min_score: float = 2.0, min_margin: float = 0.5):
+        self.min_score = min_score
+        self.min_margin = min_margin
+        # primer término del tag → [(términos del tag, {agente: peso})]
+        self._phrases: Dict[str, list[tuple[tuple[str, ...], Dict[str, float]]]] = {}
+        self._terms: Dict[str, Dict[str, float]] = {}
+
+    def build_index(self, agents: Dict):
+        """Construye el índice invertido a partir de los AgentCards registrados"""
+        phrases = defaultdict(dict)
+        terms = defaultdict(dict)
+
+        for name, agent in agents.items():
+            for skill in agent.agent_card.skills:
+                for tag in skill.tags:
+                    phrase = tuple(_terms(tag))
+                    if phrase:
+                        phrases[phrase][name] = self.TAG_WEIGHT
+                for example in skill.examples:
+                    for term in _terms(example):
+                        terms[term].setdefault(name, self.EXAMPLE_WEIGHT)
+
+        # Un término presente en varios agentes reparte su peso entre ellos
+        phrase_index = defaultdict(list)
+        for phrase, owners in phrases.items():
+            phrase_index[phrase[0]].append(
+                (phrase, {name: weight / len(owners) for name, weight in owners.items()})
+            )
+        self._phrases = dict(phrase_index)
+        self._terms = {
+            term: {name: weight / len(owners) for name, weight in owners.items()}
+            for term, owners in terms.items()
+        }
+        logging.info(f"[Skill Router] Índice construido: {len(phrases)} tags, {len(self._terms)} términos")
+
+    def score(self, description: str) -> Dict[str, float]:
+        """Puntúa el pedido contra cada agente del índice"""
+        words = _terms(description)
+        scores = defaultdict(float)
+
+        matched_terms = set()
+        matched_phrases = set()
+        for i, word in enumerate(words):
+            for phrase, owners in self._phrases.get(word, []):
+                if phrase in matched_phrases or tuple(words[i:i + len(phrase)]) != phrase:
+                    continue
+                matched_phrases.add(phrase)
+                matched_terms.update(phrase)
+                for name, weight in owners.items():
+                    scores[name] += weight
+
+        # Los términos ya cubiertos por un tag no vuelven a sumar como ejemplo
+        for word in set(words) - matched_terms:
+            for name, weight in self._terms.get(word, {}).items():
+                scores[name] += weight
+
+        return dict(scores)
+
+    def route(self, description: str) -> str | None:
+        """Devuelve el agente si la decisión local es confiable, o None para usar el LLM"""
+        ranked = sorted(self.score(description).items(), key=lambda item: item[1], reverse=True)
+        if not ranked:
+            return None
+
+        best_name, best_score = ranked[0]
+        second_score = ranked[1][1] if len(ranked) > 1 else 0.0
+
+        if best_score < self.min_score:
+            return None
+        if (best_score - second_score) / best_score <= self.min_margin:
+            return None
+        return best_name
@@ -0,0 +1,10 @@
+import re
+import unicodedata
+
+
+def normalize_text(text: str) -> str:
+    """Normaliza un texto: minúsculas, sin acentos, puntuación ni espacios repetidos"""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
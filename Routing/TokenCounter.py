@@ -0,0 +1,22 @@
+import re
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+_WORD_OR_SYMBOL = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    """Cuenta los tokens de un texto
+
+    Usa tiktoken si está instalado; si no, estima con palabras y símbolos,
+    lo cual basta para seguir la tendencia del tamaño de los prompts.
+    """
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return len(_WORD_OR_SYMBOL.findall(text))
@@ -1,29 +1,67 @@
+import argparse
 import asyncio
 import logging
 from Agents.Orchestrator import RestaurantOrchestrator
+from Agents.OrderSources import order_source_from_spec
 from MCP.McpClient import cleanup_mcp_client
+from Metrics.Metrics import metrics
 
 logging.basicConfig(
     level=logging.INFO,
     format='%(message)s'
 )
 
-async def main():
-    orchestrator = RestaurantOrchestrator()
+async def serve(orchestrator: RestaurantOrchestrator, spec: str):
+    """Modo servicio: procesa los pedidos de la fuente y reporta cada uno al admitirlo y al terminar"""
+    async for record in orchestrator.stream_orders(order_source_from_spec(spec)):
+        if record["status"] == "failed":
+            logging.error(f"✗ PEDIDO #{record['order_id']} ({record['id']}): {record.get('error', 'error desconocido')}")
+        elif record["status"] in ("accepted", "degraded"):
+            logging.info(f"→ PEDIDO #{record['order_id']} ({record['id']}) en cola de {record['agent']}"
+                         f"{' (degradado)' if record['status'] == 'degraded' else ''}, "
+                         f"espera estimada {record['estimated_wait']:.1f}s")
+        elif record["status"] == "rejected":
+            logging.warning(f"✗ PEDIDO #{record['order_id']} ({record['id']}) no admitido: {record['error']}, "
+                            f"espera estimada {record['estimated_wait']:.1f}s")
+        else:
+            logging.info(f"✓ PEDIDO #{record['order_id']} ({record['id']}) listo por {record['agent']} "
+                         f"en {record['ticket_time']:.1f}s")
+
+
+async def main(stream: str | None = None, dispatch: str = "local", replicas: int = 1,
+               balancing: str = "least_outstanding", remote_replicas: list[str] | None = None,
+               max_queue: int | None = None, overload: str = "reject", default_agent: str | None = None,
+               metrics_out: str | None = None):
+    orchestrator = RestaurantOrchestrator(
+        dispatch=dispatch,
+        replicas_per_agent=replicas,
+        balancing=balancing,
+        max_queue_per_agent=max_queue,
+        overload_policy=overload,
+        default_agent=default_agent,
+    )
     
     try:
         orchestrator.setup_agents()
+        for spec in remote_replicas or []:
+            name, _, url = spec.partition("=")
+            orchestrator.add_replica(name, url)
+        
+        if stream:
+            await serve(orchestrator, stream)
+            return
         
         # Esto cambiarlo una vez que lo integremos con Copilot 
         orders = [
             {"id": "ORD-001", "description": "Preparar una hamburguesa con queso cheddar y tocino"},
             {"id": "ORD-002", "description": "Preparar una pizza familiar con pepperoni y extra queso"},
-            {"id": "ORD-003", "description": "Preparar un hot dog con todas las salsas y cebolla caramelizada"},
+            {"id": "ORD-003", "description": "Preparar un hot dog con todas las salsas y cebolla caramelizada",
+             "priority": "delivery", "deadline": 20},
             {"id": "ORD-004", "description": "Preparar dos hamburguesas dobles con queso y pepinillos"},
             {"id": "ORD-005", "description": "Preparar una pizza vegetariana con champiñones y aceitunas"}
         ]
         
-        await orchestrator.process_orders_with_llm_routing(orders)
+        await orchestrator.process_orders_concurrently(orders)
         
         orchestrator.show_agent_discovery()
         
@@ -33,18 +71,64 @@ async def main():
         logging.info("")
         
     finally:
+        if metrics_out:
+            with open(metrics_out, "w", encoding="utf-8") as f:
+                f.write(metrics.export("json" if metrics_out.endswith(".json") else "prometheus"))
+            logging.info(f"Métricas guardadas en {metrics_out}")
+        await orchestrator.close()
         logging.info("\nCerrando conexiones MCP...")
         await cleanup_mcp_client()
         logging.info("✓ Conexiones cerradas")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Restaurante virtual multi-agente")
+    parser.add_argument(
+        "--stream",
+        help='Corre como servicio leyendo pedidos de una fuente: "stdin", "jsonl:archivo", '
+             '"jsonl+follow:archivo" o "http:puerto"'
+    )
+    parser.add_argument(
+        "--dispatch", choices=["local", "process", "http"], default="local",
+        help='"process" corre cada agente en su propio proceso; '
+             '"http" envía las tareas a los agentes servidos con python -m Agents.ChefServer'
+    )
+    parser.add_argument(
+        "--replicas", type=int, default=1,
+        help="Réplicas de cada agente (con --dispatch local o process)"
+    )
+    parser.add_argument(
+        "--balancing", choices=["least_outstanding", "p2c"], default="least_outstanding",
+        help="Cómo se reparten las tareas entre las réplicas de un agente"
+    )
+    parser.add_argument(
+        "--replica", action="append", default=[], metavar="NOMBRE=URL",
+        help='Réplica remota extra, p. ej. "Pizza Artisan=http://localhost:5013"; se puede repetir'
+    )
+    parser.add_argument(
+        "--max-queue", type=int, default=None,
+        help="Pedidos en espera por agente como máximo (por defecto sin límite)"
+    )
+    parser.add_argument(
+        "--overload", choices=["reject", "shed", "degrade"], default="reject",
+        help="Qué hacer con un pedido cuando la cola de su agente está llena"
+    )
+    parser.add_argument(
+        "--default-agent",
+        help='Agente que recibe los pedidos excedentes con --overload degrade, p. ej. "Hamburguesa Chef"'
+    )
+    parser.add_argument(
+        "--metrics-out", metavar="ARCHIVO",
+        help="Guarda las métricas al terminar, en JSON si el archivo termina en .json o en formato Prometheus"
+    )
+    args = parser.parse_args()
+    if args.overload == "degrade" and not args.default_agent:
+        parser.error("--overload degrade necesita --default-agent")
+    for spec in args.replica:
+        if "=" not in spec:
+            parser.error(f"Réplica inválida, use NOMBRE=URL: {spec}")
+
     logging.info("\nIniciando Sistema Multi-Agente A2A con MCP Integration...\n")
     
-    try:
-        import nest_asyncio
-        nest_asyncio.apply()
-    except ImportError:
-        pass
-    
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(args.stream, args.dispatch, args.replicas, args.balancing, args.replica,
+                     args.max_queue, args.overload, args.default_agent, args.metrics_out))
\ No newline at end of file
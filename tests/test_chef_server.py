@@ -0,0 +1,67 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import unittest
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ChefServerWorkersTest(unittest.TestCase):
+    """Smoke test: con varios workers el servidor arranca y responde /a2a/health"""
+
+    def setUp(self):
+        self.port = _free_port()
+        self.server = subprocess.Popen(
+            [sys.executable, "-m", "Agents.ChefServer", "--chef", "Pizza Artisan",
+             "--host", "127.0.0.1", "--port", str(self.port), "--workers", "2"],
+            cwd=ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def tearDown(self):
+        os.killpg(self.server.pid, signal.SIGTERM)
+        try:
+            self.server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.server.pid, signal.SIGKILL)
+            self.server.wait()
+
+    def _health(self) -> dict:
+        with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/a2a/health", timeout=2) as response:
+            return json.load(response)
+
+    def test_health_with_two_workers(self):
+        deadline = time.monotonic() + 60
+        health = None
+        while health is None and time.monotonic() < deadline:
+            self.assertIsNone(self.server.poll(), "el servidor terminó antes de responder")
+            try:
+                health = self._health()
+            except OSError:
+                time.sleep(0.5)
+        self.assertIsNotNone(health, "el servidor no respondió /a2a/health a tiempo")
+        self.assertEqual(health["status"], "ok")
+        self.assertEqual(health["agent"], "Pizza Artisan")
+
+        # Pasado el health check del supervisor los workers siguen atendiendo
+        time.sleep(6)
+        for _ in range(5):
+            self.assertEqual(self._health()["status"], "ok")
+        self.assertIsNone(self.server.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()